@@ -4,13 +4,14 @@ import numpy as np
 import base64
 from flask import Flask
 from flask_socketio import SocketIO
+import features  # Shared landmark math
+from overlay import DEFAULT_STYLE, HAND_STATE_STYLES, draw_overlay  # Batched landmark drawing
 
 # Initialize Flask app
 app = Flask(__name__)
 socketio = SocketIO(app, cors_allowed_origins="*")  # Enable WebSocket communication with frontend
 
 # MediaPipe setup for hand tracking
-mp_drawing = mp.solutions.drawing_utils  # Utility for drawing hand landmarks
 mp_hands = mp.solutions.hands  # Hand tracking module
 
 # Open webcam for video capture
@@ -25,17 +26,7 @@ open_close_count = 0  # Counter for hand open-close actions
 def classify_hand_state(landmarks):
     global hand_state_prev, open_close_count  # Access global variables
 
-    finger_tips = [8, 12, 16, 20]  # Indices of fingertip landmarks
-    curled_fingers = sum(1 for tip in finger_tips if landmarks.landmark[tip].y > landmarks.landmark[tip - 2].y)  
-    # Count the number of fingers that are curled (lower than their corresponding knuckles)
-
-    # Determine the hand state based on the number of curled fingers
-    if curled_fingers == 0:
-        current_state = "Fully Open"
-    elif curled_fingers == 4:
-        current_state = "Fully Closed"
-    else:
-        current_state = "Half Closed"
+    current_state = features.hand_state(features.to_array(landmarks))  # Curl test on all fingertips at once
 
     # Count the number of open-close cycles
     if hand_state_prev == "Fully Closed" and current_state == "Fully Open":
@@ -73,10 +64,9 @@ def start_video():
                 elif hand_state == "Fully Closed":
                     node_color = (0, 0, 255)  # Red for fully closed
 
-                # Draw hand landmarks with the determined color
-                mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                                          mp_drawing.DrawingSpec(color=node_color, thickness=2, circle_radius=4),
-                                          mp_drawing.DrawingSpec(color=node_color, thickness=2, circle_radius=2))
+                # Draw hand landmarks with the (cached) style of this state
+                draw_overlay(image, "hands", [features.to_array(hand_landmarks)],
+                             HAND_STATE_STYLES.get(hand_state, DEFAULT_STYLE))
 
         # Display hand state text on the frame
         cv2.putText(image, f"Hand: {hand_state}", (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 1, node_color, 2)
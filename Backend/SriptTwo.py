@@ -1,17 +1,18 @@
 import cv2
 import mediapipe as mp
-import numpy as np
 import base64
 from flask import Flask
 from flask_socketio import SocketIO
+import features  # Shared landmark math
+from overlay import Style, draw_overlay  # Batched landmark drawing
 
 # Initialize Flask app
 app = Flask(__name__)
 socketio = SocketIO(app, cors_allowed_origins="*")  # Enable WebSocket communication with frontend
 
 # MediaPipe setup for hand tracking
-mp_drawing = mp.solutions.drawing_utils
 mp_hands = mp.solutions.hands
+ROTATION_STYLE = Style((255, 0, 255), (255, 0, 255), 2, 4)  # Built once, not per frame
 
 # Open webcam for video capture
 cap = cv2.VideoCapture(0)
@@ -26,13 +27,7 @@ rotated_once = False
 # Function to calculate wrist rotation angle
 def calculate_wrist_angle(landmarks):
     # Using wrist (0) and middle finger MCP (9) to estimate rotation
-    wrist = landmarks.landmark[0]
-    middle_mcp = landmarks.landmark[9]
-
-    dx = middle_mcp.x - wrist.x
-    dy = middle_mcp.y - wrist.y
-    angle = np.arctan2(dy, dx) * 180 / np.pi  # Angle in degrees
-    return angle
+    return features.wrist_angle(features.to_array(landmarks))  # Angle in degrees
 
 # WebSocket event handler to start video processing for wrist rotations
 @socketio.on("start_rotation")
@@ -77,9 +72,7 @@ def start_rotation():
                 node_color = (255, 0, 255)
 
                 # Draw landmarks
-                mp_drawing.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                                          mp_drawing.DrawingSpec(color=node_color, thickness=2, circle_radius=4),
-                                          mp_drawing.DrawingSpec(color=node_color, thickness=2, circle_radius=2))
+                draw_overlay(image, "hands", [features.to_array(hand_landmarks)], ROTATION_STYLE)
 
         # Reset rotated_once if hand not detected
         if not results.multi_hand_landmarks:
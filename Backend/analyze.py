@@ -0,0 +1,237 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from buffers import FrameBuffers
+from exercises import EXERCISES
+from filters import LandmarkSmoother
+from models import MODEL_FACTORIES
+from roi import InferenceRegion
+from scheduler import run_model
+
+# =====================================================
+# 🗂️ Bulk Offline Analysis
+# =====================================================
+# Re-scores recorded therapy videos with the same exercise plugins the
+# live sessions use. Every file is streamed frame by frame (never loaded
+# whole) in its own worker process, each model runs once per frame for
+# all exercises that need it, and one row per (file, exercise) goes to
+# CSV or Parquet:
+#
+#   python analyze.py videos/ -o scores.csv
+#   python analyze.py videos/ -e fingertap -e armraise --workers 8 -o scores.parquet
+#
+# Frames are mirrored before inference like the live camera (--no-flip
+# for videos that already are).
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v")
+DEFAULT_EXERCISES = ("openclose", "rotation", "joinhands", "fingertap", "armraise")
+
+COLUMNS = [
+    "file", "exercise", "duration_s", "frames", "frames_detected", "count",
+    "accuracy_mean", "accuracy_max", "angle_min", "angle_max", "angle_range",
+    "taps", "tap_mean_s", "tap_min_s", "tap_max_s", "error",
+]
+
+
+class Score:
+    """Accumulates one exercise's payloads over a whole video."""
+
+    def __init__(self):
+        self.frames_detected = 0
+        self.count = 0
+        self.accuracy = []
+        self.angle_min = None
+        self.angle_max = None
+        self.tap_durations = []
+        self.tracks_taps = False
+        self.cycles = 0
+        self.seen_taps = 0
+
+    def add(self, payload, detected):
+        self.frames_detected += detected
+        self.count = payload.get("count", self.count)
+        if detected and payload.get("accuracy") is not None:
+            self.accuracy.append(payload["accuracy"])
+        angle = payload.get("angle")
+        if detected and angle is not None:
+            self.angle_min = angle if self.angle_min is None else min(self.angle_min, angle)
+            self.angle_max = angle if self.angle_max is None else max(self.angle_max, angle)
+        if "taps" in payload:
+            self._add_taps(payload)
+
+    def _add_taps(self, payload):
+        # Finger tap keeps the current cycle in "taps" and moves it to
+        # "summary" when the fourth finger completes.
+        self.tracks_taps = True
+        if payload["count"] > self.cycles:
+            new = payload["summary"][self.seen_taps:]
+            self.cycles, self.seen_taps = payload["count"], 0
+        else:
+            new = payload["taps"][self.seen_taps:]
+            self.seen_taps = len(payload["taps"])
+        self.tap_durations += [tap["duration"] for tap in new]
+
+    def row(self):
+        taps = np.array(self.tap_durations)
+        angle_range = None if self.angle_min is None else round(self.angle_max - self.angle_min, 1)
+        return {
+            "frames_detected": self.frames_detected,
+            "count": self.count,
+            "accuracy_mean": round(float(np.mean(self.accuracy)), 1) if self.accuracy else None,
+            "accuracy_max": max(self.accuracy) if self.accuracy else None,
+            "angle_min": self.angle_min,
+            "angle_max": self.angle_max,
+            "angle_range": angle_range,
+            "taps": len(taps) if self.tracks_taps else None,
+            "tap_mean_s": round(float(taps.mean()), 3) if len(taps) else None,
+            "tap_min_s": round(float(taps.min()), 3) if len(taps) else None,
+            "tap_max_s": round(float(taps.max()), 3) if len(taps) else None,
+        }
+
+
+def analyze_file(path, names, flip=True, stride=1, scale=1.0):
+    """Stream one video through ``names`` exercises; returns one row per exercise."""
+    exercises = [EXERCISES[name]() for name in names]
+    kinds = sorted({kind for exercise in exercises for kind in (exercise.model, *exercise.schedule)})
+    scores = {exercise.name: Score() for exercise in exercises}
+    base = {"file": path}
+
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return [{**base, "exercise": name, "error": "cannot open video"} for name in names]
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    models = {kind: MODEL_FACTORIES[kind]() for kind in kinds}
+    regions = {kind: InferenceRegion(scale) for kind in kinds}
+    smoothers = {kind: LandmarkSmoother(stride, smooth=False) for kind in kinds}
+    flipped, rgb_buffers = FrameBuffers(), FrameBuffers()
+    frames = 0
+    image = None
+    try:
+        while True:
+            success, image = cap.read(image)    # decode into last frame's array
+            if not success:
+                break
+            timestamp = frames / fps
+            frames += 1
+            if flip:
+                image = cv2.flip(image, 1, dst=flipped.get(image.shape, image.dtype))
+            rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_buffers.get(image.shape, image.dtype))
+
+            arrays = {}
+            for kind in kinds:
+                if smoothers[kind].should_infer():
+                    arrays[kind] = run_model(models[kind], kind, rgb, regions[kind], smoothers[kind], timestamp)
+                else:
+                    arrays[kind] = smoothers[kind].predict(timestamp)
+
+            # Offline every model runs on every frame, scheduled ones included
+            packet = {"seq": frames, "timestamp": timestamp, "size": image.shape[:2], "models": arrays}
+            for exercise in exercises:
+                groups = arrays[exercise.model]
+                scores[exercise.name].add(exercise.update(groups, packet), bool(groups))
+    finally:
+        cap.release()
+        for model in models.values():
+            model.close()
+
+    duration = round(frames / fps, 2)
+    return [{**base, "exercise": name, "duration_s": duration, "frames": frames, **scores[name].row()}
+            for name in names]
+
+
+def _analyze(job):
+    path, names, options = job
+    started = time.perf_counter()
+    try:
+        rows = analyze_file(path, names, **options)
+    except Exception as e:
+        rows = [{"file": path, "exercise": name, "error": str(e)} for name in names]
+    return path, rows, time.perf_counter() - started
+
+
+def find_videos(directory, recursive=False):
+    if recursive:
+        paths = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
+    else:
+        paths = [os.path.join(directory, name) for name in os.listdir(directory)]
+    return sorted(path for path in paths if path.lower().endswith(VIDEO_EXTENSIONS))
+
+
+class CsvWriter:
+    """Writes rows as they arrive, so a crash mid-run keeps finished files."""
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Collects rows and writes one Parquet file at the end (needs pandas + pyarrow)."""
+
+    def __init__(self, path):
+        import pandas  # fail before any video is processed if it is missing
+        self.pandas = pandas
+        self.path = path
+        self.rows = []
+
+    def write(self, rows):
+        self.rows += rows
+
+    def close(self):
+        self.pandas.DataFrame(self.rows, columns=COLUMNS).to_parquet(self.path, index=False)
+
+
+def run(paths, names, output, workers=None, **options):
+    writer = ParquetWriter(output) if output.endswith(".parquet") else CsvWriter(output)
+    jobs = [(path, names, options) for path in paths]
+    started = time.perf_counter()
+    try:
+        with multiprocessing.get_context("spawn").Pool(workers or os.cpu_count()) as pool:
+            for done, (path, rows, seconds) in enumerate(pool.imap_unordered(_analyze, jobs), 1):
+                writer.write([{column: row.get(column) for column in COLUMNS} for row in rows])
+                errors = [row["error"] for row in rows if row.get("error")]
+                status = f"⚠️ {errors[0]}" if errors else "✅"
+                print(f"{status} [{done}/{len(jobs)}] {path} ({seconds:.1f}s)", file=sys.stderr)
+    finally:
+        writer.close()
+    print(f"🗂️ {len(jobs)} videos in {time.perf_counter() - started:.1f}s → {output}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a directory of recorded exercise videos.")
+    parser.add_argument("directory")
+    parser.add_argument("-e", "--exercise", action="append", choices=sorted(EXERCISES),
+                        help="exercise to score (repeatable; default: all counting exercises)")
+    parser.add_argument("-o", "--output", default="scores.csv", help=".csv or .parquet")
+    parser.add_argument("--workers", type=int, help="processes (default: one per core)")
+    parser.add_argument("--recursive", action="store_true", help="include subdirectories")
+    parser.add_argument("--no-flip", action="store_true", help="videos are already mirrored")
+    parser.add_argument("--stride", type=int, default=1, help="run the models every k-th frame")
+    parser.add_argument("--scale", type=float, default=1.0, help="downscale model input")
+    args = parser.parse_args(argv)
+
+    paths = find_videos(args.directory, args.recursive)
+    if not paths:
+        parser.error(f"no videos found in {args.directory}")
+    run(paths, args.exercise or list(DEFAULT_EXERCISES), args.output, args.workers,
+        flip=not args.no_flip, stride=args.stride, scale=args.scale)
+
+
+if __name__ == "__main__":
+    main()
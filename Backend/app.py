@@ -1,14 +1,13 @@
-import cv2
-import mediapipe as mp
-import numpy as np
-import base64
-from flask import Flask
-from flask_socketio import SocketIO
-from ScriptThree import joinhands_loop, stop_joinhands_loop
-import threading
-
-
-import threading
+import startup
+from flask import Flask, Response, jsonify, request
+from flask_socketio import SocketIO, join_room, leave_room
+from sessions import sessions
+from supervisor import supervisor
+from models import model_pool
+import engine
+import history
+from broadcast import MJPEG_MIMETYPE, hub, mjpeg_stream
+import metrics
 
 # =====================================================
 # 🧩 Flask + SocketIO Setup
@@ -16,234 +15,192 @@ import threading
 app = Flask(__name__)
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
 
-# =====================================================
-# 🧠 MediaPipe Models
-# =====================================================
-mp_drawing = mp.solutions.drawing_utils
-mp_hands = mp.solutions.hands
-mp_pose = mp.solutions.pose
+# Exercise logic lives in exercises.py; engine.py runs it per session and
+# borrows models from models.model_pool. Models are built on first use
+# (or pre-warmed in the background below) and the camera opens only when
+# a session starts.
+startup.mark("imports")
 
-hands = mp_hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
 
 # =====================================================
-# 🎥 Camera Setup
-# =====================================================
-cap = cv2.VideoCapture(0)
-lock = threading.Lock()
-# =====================================================
-# ▶️ Run flags (REQUIRED to stop loops on Retry)
+# 👥 Session helpers
 # =====================================================
+def start_exercise(name, data=None):
+    """(Re)start ``name`` in the calling client's session."""
+    session = sessions.get(request.sid)
+    try:
+        engine.start(session, socketio, name, data)
+    except KeyError:
+        socketio.emit("session_error", {"exercise": name, "error": "Unknown exercise"}, to=request.sid)
+    except RuntimeError as e:
+        print(f"⚠️ {e}")
+        socketio.emit("session_error", {"exercise": name, "error": str(e)}, to=request.sid)
 
-run_openclose = False
-run_rotation = False
-run_joinhands = False
 
+def stop_exercise(name=None):
+    """Stop ``name`` (or whatever runs) in the calling client's session."""
+    sessions.get(request.sid).stop(name)
 
 
-# =====================================================
-# 📊 Shared States
-# =====================================================
-open_close_count = 0
-hand_state_prev = "Unknown"
+@socketio.on("disconnect")
+def on_disconnect(reason=None):
+    sessions.close(request.sid)
 
-rotation_count = 0
-previous_angle = None
-rotated_once = False
-
-rep_count = 0
-hands_above_head = False
-accuracy = 0
 
 # =====================================================
-# 🧮 Helper Functions
+# 🏋️ Generic exercise API → any plugin in exercises.EXERCISES
 # =====================================================
-
-def classify_hand_state(landmarks):
-    """Detect whether hand is open, closed, or half closed."""
-    global hand_state_prev, open_close_count
-    finger_tips = [8, 12, 16, 20]
-    curled_fingers = sum(1 for tip in finger_tips if landmarks.landmark[tip].y > landmarks.landmark[tip - 2].y)
-
-    if curled_fingers == 0:
-        current_state = "Fully Open"
-    elif curled_fingers == 4:
-        current_state = "Fully Closed"
-    else:
-        current_state = "Half Closed"
-
-    if hand_state_prev == "Fully Closed" and current_state == "Fully Open":
-        open_close_count += 1
-
-    hand_state_prev = current_state
-    return current_state
-
-
-def calculate_wrist_angle(landmarks):
-    """Calculate wrist rotation angle."""
-    wrist = landmarks.landmark[0]
-    middle_mcp = landmarks.landmark[9]
-    dx = middle_mcp.x - wrist.x
-    dy = middle_mcp.y - wrist.y
-    angle = np.arctan2(dy, dx) * 180 / np.pi
-    return angle
+@socketio.on("start_exercise")
+def on_start_exercise(data):
+    print(f"▶️ {data.get('exercise')} Started")
+    start_exercise(data.get("exercise"), data)
 
 
-def euclidean_distance(pt1, pt2):
-    return np.linalg.norm(np.array(pt1) - np.array(pt2))
+@socketio.on("stop_exercise")
+def on_stop_exercise(data=None):
+    stop_exercise((data or {}).get("exercise"))
+    print("🛑 Exercise stopped")
 
 
-def calculate_accuracy(left, right):
-    """Generic accuracy measure for proximity."""
-    dist = euclidean_distance(left, right)
-    normalized = min(dist / 0.25, 1.0)
-    return round((1 - normalized) * 100, 2)
-# ===============================
-# 🛑 STOP ALL EXERCISES (ADD HERE)
-# ===============================
-def stop_all():
-    global run_openclose, run_rotation, run_joinhands
-    run_openclose = False
-    run_rotation = False
-    run_joinhands = False
-
 # =====================================================
 # ✋ EXERCISE 1 → Hand Open-Close
 # =====================================================
 @socketio.on("start_openclose")
-def start_openclose():
-    global run_openclose, open_close_count, hand_state_prev
-
-    stop_all()
-    run_openclose = True
-    open_close_count = 0
-    hand_state_prev = "Unknown"
-
+def start_openclose(data=None):
     print("▶️ Open–Close Exercise Started")
-
-    while run_openclose:
-        with lock:
-            success, image = cap.read()
-        if not success:
-            continue
-
-        image = cv2.flip(image, 1)
-        results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-
-        state = "No Hand"
-        if results.multi_hand_landmarks:
-            for hl in results.multi_hand_landmarks:
-                state = classify_hand_state(hl)
-                mp_drawing.draw_landmarks(image, hl, mp_hands.HAND_CONNECTIONS)
-
-        cv2.putText(image, f"State: {state}", (30, 40),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 2)
-        cv2.putText(image, f"Count: {open_close_count}", (30, 80),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
-
-        _, buffer = cv2.imencode(".jpg", image)
-        socketio.emit("video_feed", {
-            "frame": base64.b64encode(buffer).decode(),
-            "count": open_close_count
-        })
+    start_exercise("openclose", data)
 
 @socketio.on("stop_openclose")
 def stop_openclose():
-    global run_openclose
-    run_openclose = False
+    stop_exercise("openclose")
     print("🛑 Open–Close stopped")
-       
 
 
-        
-
+# =====================================================
+# 🔄 EXERCISE 2 → Wrist Rotation
+# =====================================================
 @socketio.on("start_rotation")
-def start_rotation():
-    global run_rotation, rotation_count, previous_angle, rotated_once
-
-    stop_all()
-    run_rotation = True
-    rotation_count = 0
-    previous_angle = None
-    rotated_once = False
-
+def start_rotation(data=None):
     print("▶️ Wrist Rotation Started")
+    start_exercise("rotation", data)
 
-    while run_rotation:
-        with lock:
-            success, image = cap.read()
-        if not success:
-            continue
-
-        image = cv2.flip(image, 1)
-        results = hands.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-
-        if results.multi_hand_landmarks:
-            for hl in results.multi_hand_landmarks:
-                angle = calculate_wrist_angle(hl)
-
-                if previous_angle is not None:
-                    diff = angle - previous_angle
-                    if diff > 180: diff -= 360
-                    if diff < -180: diff += 360
-
-                    if abs(diff) > 30 and not rotated_once:
-                        rotation_count += 1
-                        rotated_once = True
-                    elif abs(diff) < 10:
-                        rotated_once = False
-
-                previous_angle = angle
-                mp_drawing.draw_landmarks(image, hl, mp_hands.HAND_CONNECTIONS)
-
-        cv2.putText(image, f"Rotations: {rotation_count}", (30, 50),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 2)
-
-        _, buffer = cv2.imencode(".jpg", image)
-        socketio.emit("rotation_feed", {
-            "image": base64.b64encode(buffer).decode(),
-            "count": rotation_count
-        })
 @socketio.on("stop_rotation")
 def stop_rotation():
-    global run_rotation
-    run_rotation = False
+    stop_exercise("rotation")
     print("🛑 Rotation stopped")
 
 
-
+# =====================================================
+# 🙌 EXERCISE 3 → Join Hands Above Head (REPS)
+# =====================================================
 @socketio.on("start_joinhands")
-def start_joinhands():
+def start_joinhands(data=None):
     print("▶️ JoinHands START received")
-    t = threading.Thread(target=joinhands_loop, args=(socketio,))
-    t.start()
+    start_exercise("joinhands", data)
 
 
 @socketio.on("stop_joinhands")
 def stop_joinhands():
     print("🛑 JoinHands STOP received")
-    stop_joinhands_loop()
+    stop_exercise("joinhands")
+
+
+@socketio.on("frame_ack")
+def frame_ack(data):
+    """The client received frame ``seq``; feeds its quality/rate control."""
+    delivery = sessions.get(request.sid).delivery
+    if delivery is not None:
+        delivery.ack(data.get("seq"))
 
 
+@socketio.on("get_pipeline_stats")
+def get_pipeline_stats():
+    """Report per-stage queue depth and drop counts to find the bottleneck."""
+    socketio.emit("pipeline_stats", {
+        **sessions.get(request.sid).stats(),
+        "sessions": len(sessions),
+        "models": model_pool.stats(),
+        "supervisor": supervisor.stats(),
+        "viewers": hub.stats(),
+    }, to=request.sid)
 
 
 # =====================================================
-# 🙌 EXERCISE 3 → Join Hands Above Head (REPS)
+# 📡 Viewers → MJPEG over HTTP or socket observers
+# =====================================================
+@app.route("/watch/<key>.mjpg")
+def watch_mjpeg(key):
+    """Live session video for an <img> tag; encoded once however many watch."""
+    broadcast = hub.get(key)
+    if broadcast is None:
+        return Response("no such session\n", status=404, mimetype="text/plain")
+    return Response(mjpeg_stream(broadcast), mimetype=MJPEG_MIMETYPE)
+
+
+@socketio.on("watch_session")
+def watch_session(data=None):
+    """Join the session's watch room to receive its frame/payload emits."""
+    key = str((data or {}).get("key"))
+    broadcast = hub.get(key)
+    if broadcast is None:
+        socketio.emit("session_error", {"watch_key": key, "error": "No such session"}, to=request.sid)
+        return
+    join_room(broadcast.room)
+    socketio.emit("watching", {"key": key, "mjpeg": f"/watch/{key}.mjpg"}, to=request.sid)
+
+
+@socketio.on("unwatch_session")
+def unwatch_session(data=None):
+    broadcast = hub.get(str((data or {}).get("key")))
+    if broadcast is not None:
+        leave_room(broadcast.room)
+
+
+# =====================================================
+# 📈 Metrics → Prometheus scrape + dashboard event
+# =====================================================
+if metrics.ENABLED:
+    metrics.register_server_gauges(sessions, model_pool, supervisor)
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    if not metrics.ENABLED:
+        return Response("metrics disabled (set MOTIONAID_METRICS=1)\n", status=404, mimetype="text/plain")
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
+
+
+@socketio.on("get_metrics")
+def get_metrics():
+    """Metrics snapshot for the React dashboard (same data as /metrics)."""
+    socketio.emit("metrics", {"enabled": metrics.ENABLED, "metrics": metrics.registry.snapshot()}, to=request.sid)
+
+
+# =====================================================
+# 🗄️ Session history → progress over time
 # =====================================================
+@app.route("/history")
+def history_endpoint():
+    reply = history.answer(history.get_store(), request.args.to_dict())
+    return jsonify(reply), 400 if "error" in reply else 200
+
+
+@socketio.on("get_history")
+def get_history(data=None):
+    """Progress per day (or one session's reps/samples, with packed landmarks)."""
+    socketio.emit("history", history.answer(history.get_store(), data or {}, landmarks=True), to=request.sid)
+
+
+@socketio.on("get_startup_report")
+def get_startup_report():
+    socketio.emit("startup_report", startup.report(), to=request.sid)
 
-      
 
 # =====================================================
 # 🚀 Run Server
 # =====================================================
 if __name__ == "__main__":
+    model_pool.prewarm_in_background(on_done=lambda kind, seconds: startup.mark(f"prewarm_{kind}", seconds))
+    startup.mark("server_ready")
     print("✅ MotionAid Flask Backend Running → http://localhost:5000")
     socketio.run(app, host="0.0.0.0", port=5000, allow_unsafe_werkzeug=True)
-@socketio.on("start_joinhands")
-def start_joinhands():
-    print("▶️ JoinHands START received")
-    t = threading.Thread(target=joinhands_loop, args=(socketio,))
-    t.start()
-
-
-
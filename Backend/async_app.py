@@ -0,0 +1,298 @@
+import startup
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl
+
+import socketio
+import uvicorn
+
+import engine
+import history
+from broadcast import MJPEG_MIMETYPE, hub, mjpeg_part
+import metrics
+from models import model_pool
+from sessions import sessions
+from supervisor import supervisor
+
+# =====================================================
+# ⚡ Asyncio Socket.IO Server (alternative to app.py)
+# =====================================================
+# Same socket API as app.py, served by python-socketio's AsyncServer over
+# ASGI so one process can hold many idle connections cheaply:
+#
+#   python async_app.py           (pip install uvicorn)
+#
+# Handlers never block the event loop. Starting an exercise (which may
+# build a MediaPipe graph and open the camera) and stopping it (which
+# joins the stage threads) run in the default executor from a scheduled
+# task; the pipeline stages themselves are the CPU workers. Frames are
+# sent back on the loop with at most one send in flight per client, so a
+# slow client loses frames instead of queueing them.
+
+# Engine.IO packets allowed to wait in a client's outbound queue
+MAX_QUEUED_SENDS = 2
+
+# MJPEG viewers wait for frames on their own threads, so however many
+# watch they never hold up the default executor that starts and stops
+# exercises. Viewers beyond this many share the threads (and lag).
+MAX_VIEWER_THREADS = int(os.environ.get("MOTIONAID_VIEWER_THREADS", "16"))
+VIEWER_WAIT = 1.0       # seconds a viewer thread waits before checking for a disconnect
+viewer_executor = ThreadPoolExecutor(MAX_VIEWER_THREADS, thread_name_prefix="mjpeg-viewer")
+
+sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+startup.mark("imports")
+
+
+class AsyncEmitter:
+    """``emit``/``emit_frame``/``sleep`` for pipeline threads that send on the event loop.
+
+    ``emit`` always delivers (session errors, stats). Frames sent through
+    ``emit_frame`` to a client whose previous frame has not gone out yet
+    are dropped and counted.
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.loop = None
+        self.pending = {}
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.drop_counter = metrics.pipeline_metrics.dropped("send") if metrics.pipeline_metrics else None
+
+    def _backlogged(self, sid):
+        future = self.pending.get(sid)
+        if future is not None and not future.done():
+            return True
+        # Engine.IO queues packets per socket; peek at the depth where the server exposes it
+        try:
+            eio_sid = self.server.manager.eio_sid_from_sid(sid, "/")
+            return self.server.eio.sockets[eio_sid].queue.qsize() >= MAX_QUEUED_SENDS
+        except (AttributeError, KeyError):
+            return False
+
+    def emit(self, event, data=None, to=None):
+        asyncio.run_coroutine_threadsafe(self.server.emit(event, data, to=to), self.loop)
+
+    def emit_frame(self, event, data=None, to=None):
+        """Send one exercise frame unless ``to`` is backlogged; returns False when dropped."""
+        with self.lock:
+            if self._backlogged(to):
+                self.dropped += 1
+                if self.drop_counter is not None:
+                    self.drop_counter.inc()
+                return False
+            self.pending[to] = asyncio.run_coroutine_threadsafe(self.server.emit(event, data, to=to), self.loop)
+            return True
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def forget(self, sid):
+        with self.lock:
+            self.pending.pop(sid, None)
+
+
+emitter = AsyncEmitter(sio)
+if metrics.ENABLED:
+    metrics.register_server_gauges(sessions, model_pool, supervisor)
+
+
+# =====================================================
+# 👥 Session helpers
+# =====================================================
+async def start_exercise(session, name, data=None):
+    """Start ``name`` in ``session``, taken by the handler before a later disconnect can close it."""
+    sid = session.sid
+    emitter.loop = asyncio.get_running_loop()
+    try:
+        await emitter.loop.run_in_executor(None, engine.start, session, emitter, name, data)
+    except KeyError:
+        await sio.emit("session_error", {"exercise": name, "error": "Unknown exercise"}, to=sid)
+    except RuntimeError as e:
+        print(f"⚠️ {e}")
+        await sio.emit("session_error", {"exercise": name, "error": str(e)}, to=sid)
+
+
+async def stop_exercise(session, name=None):
+    await asyncio.get_running_loop().run_in_executor(None, session.stop, name)
+
+
+tasks = set()
+
+
+def schedule(coro):
+    """Run ``coro`` as a task so the handler returns immediately."""
+    task = asyncio.get_running_loop().create_task(coro)
+    tasks.add(task)     # the loop only keeps weak references
+    task.add_done_callback(tasks.discard)
+    return task
+
+
+@sio.event
+async def disconnect(sid, reason=None):
+    emitter.forget(sid)
+    await asyncio.get_running_loop().run_in_executor(None, sessions.close, sid)
+
+
+# =====================================================
+# 🏋️ Exercise API (generic + per-exercise events)
+# =====================================================
+@sio.on("start_exercise")
+async def on_start_exercise(sid, data):
+    print(f"▶️ {data.get('exercise')} Started")
+    schedule(start_exercise(sessions.get(sid), data.get("exercise"), data))
+
+
+@sio.on("stop_exercise")
+async def on_stop_exercise(sid, data=None):
+    schedule(stop_exercise(sessions.get(sid), (data or {}).get("exercise")))
+    print("🛑 Exercise stopped")
+
+
+def register_exercise_events(name):
+    async def on_start(sid, data=None):
+        print(f"▶️ {name} Started")
+        schedule(start_exercise(sessions.get(sid), name, data))
+
+    async def on_stop(sid, data=None):
+        schedule(stop_exercise(sessions.get(sid), name))
+        print(f"🛑 {name} stopped")
+
+    sio.on(f"start_{name}", on_start)
+    sio.on(f"stop_{name}", on_stop)
+
+
+for exercise_name in ("openclose", "rotation", "joinhands"):
+    register_exercise_events(exercise_name)
+
+
+@sio.on("frame_ack")
+async def frame_ack(sid, data):
+    delivery = sessions.get(sid).delivery
+    if delivery is not None:
+        delivery.ack(data.get("seq"))
+
+
+@sio.on("get_pipeline_stats")
+async def get_pipeline_stats(sid, data=None):
+    await sio.emit("pipeline_stats", {
+        **sessions.get(sid).stats(),
+        "sessions": len(sessions),
+        "models": model_pool.stats(),
+        "supervisor": supervisor.stats(),
+        "send_dropped": emitter.dropped,
+        "viewers": hub.stats(),
+    }, to=sid)
+
+
+@sio.on("watch_session")
+async def watch_session(sid, data=None):
+    key = str((data or {}).get("key"))
+    broadcast = hub.get(key)
+    if broadcast is None:
+        await sio.emit("session_error", {"watch_key": key, "error": "No such session"}, to=sid)
+        return
+    await sio.enter_room(sid, broadcast.room)
+    await sio.emit("watching", {"key": key, "mjpeg": f"/watch/{key}.mjpg"}, to=sid)
+
+
+@sio.on("unwatch_session")
+async def unwatch_session(sid, data=None):
+    broadcast = hub.get(str((data or {}).get("key")))
+    if broadcast is not None:
+        await sio.leave_room(sid, broadcast.room)
+
+
+@sio.on("get_history")
+async def get_history(sid, data=None):
+    reply = await asyncio.get_running_loop().run_in_executor(
+        None, lambda: history.answer(history.get_store(), data or {}, landmarks=True))
+    await sio.emit("history", reply, to=sid)
+
+
+@sio.on("get_startup_report")
+async def get_startup_report(sid, data=None):
+    await sio.emit("startup_report", startup.report(), to=sid)
+
+
+@sio.on("get_metrics")
+async def get_metrics(sid, data=None):
+    await sio.emit("metrics", {"enabled": metrics.ENABLED, "metrics": metrics.registry.snapshot()}, to=sid)
+
+
+# =====================================================
+# 📈 Plain HTTP: /metrics, /history and /watch/<key>.mjpg
+# =====================================================
+async def wait_disconnect(receive):
+    while (await receive())["type"] != "http.disconnect":
+        pass
+
+
+async def send_mjpeg(broadcast, receive, send):
+    """Stream a session's frames until it stops or the viewer disconnects.
+
+    Waits happen on viewer_executor; a slow client skips frames.
+    """
+    loop = asyncio.get_running_loop()
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", MJPEG_MIMETYPE.encode())]})
+    disconnected = loop.create_task(wait_disconnect(receive))
+    broadcast.add_viewer(1)
+    try:
+        seq = 0
+        while not disconnected.done():
+            waiting = loop.run_in_executor(viewer_executor, broadcast.wait, seq, VIEWER_WAIT)
+            await asyncio.wait({waiting, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                return
+            frame = waiting.result()
+            if frame is None:
+                if broadcast.closed:
+                    break
+                continue
+            seq, jpeg = frame
+            await send({"type": "http.response.body", "body": mjpeg_part(jpeg), "more_body": True})
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        broadcast.add_viewer(-1)
+        disconnected.cancel()
+
+
+async def http_app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    path = scope["path"]
+    if path.startswith("/watch/") and path.endswith(".mjpg"):
+        broadcast = hub.get(path[len("/watch/"):-len(".mjpg")])
+        if broadcast is not None:
+            await send_mjpeg(broadcast, receive, send)
+            return
+    if path == "/metrics" and metrics.ENABLED:
+        status, body, content_type = 200, metrics.registry.render(), "text/plain; version=0.0.4"
+    elif path == "/history":
+        query = dict(parse_qsl(scope.get("query_string", b"").decode()))
+        reply = await asyncio.get_running_loop().run_in_executor(
+            None, history.answer, history.get_store(), query)
+        status, body, content_type = 400 if "error" in reply else 200, json.dumps(reply), "application/json"
+    else:
+        status, body, content_type = 404, "not found\n", "text/plain"
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type.encode())]})
+    await send({"type": "http.response.body", "body": body.encode()})
+
+
+app = socketio.ASGIApp(sio, other_asgi_app=http_app)
+
+
+# =====================================================
+# 🚀 Run Server
+# =====================================================
+if __name__ == "__main__":
+    model_pool.prewarm_in_background(on_done=lambda kind, seconds: startup.mark(f"prewarm_{kind}", seconds))
+    startup.mark("server_ready")
+    print("✅ MotionAid asyncio Backend Running → http://localhost:5000")
+    uvicorn.run(app, host="0.0.0.0", port=5000)
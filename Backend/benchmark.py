@@ -0,0 +1,427 @@
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+import engine
+from camera import Frame
+from exercises import EXERCISES
+from models import model_pool
+from recording import META_FILE, ReplaySource
+from sessions import Session
+
+# =====================================================
+# 📊 Headless Exercise Benchmarks
+# =====================================================
+# Runs each exercise through the real engine pipeline without a display,
+# browser or socket server. Frames come from a recording (see
+# recording.py) or a synthetic clip, emits go to a counting sink, and the
+# results (fps, p50/p95/p99 latency, CPU, peak RSS, per-stage time) are
+# written as JSON so runs can be compared across commits and machines.
+#
+#   python benchmark.py                                  # every exercise, synthetic 640x480
+#   python benchmark.py -e fingertap -e armraise --frames 600 -o run.json
+#   python benchmark.py --source recordings/taps --baseline run.json
+#
+# Latency is measured from the moment the capture stage hands a frame on
+# until its emit returns; "capture" stage time includes waiting for the
+# source. Each exercise runs in a fresh process so peak RSS and model
+# state do not leak between them (--no-isolate to run in-process).
+#
+#   python benchmark.py --memory --frames 600            # allocations per frame
+#
+# --memory runs the same stages one after another in a single thread under
+# tracemalloc and reports, after a warm-up, the bytes allocated while a
+# frame goes through each stage, how much stays allocated across frames,
+# and the garbage collections (and their pauses) the frames caused.
+
+RESULTS_VERSION = 1
+DRAIN_SECONDS = 1.0     # quiet period after the source ends before stopping
+MEMORY_WARMUP = 30      # frames before --memory starts counting (buffers, model state)
+
+
+class SyntheticSource:
+    """A generated clip behind the CameraProducer interface.
+
+    A disc moves across a gradient so JPEG sizes resemble a real scene.
+    ``fps`` paces frames like a camera; 0 hands them out as fast as the
+    pipeline asks.
+    """
+
+    mirrored = True
+    exclusive = True
+
+    def __init__(self, frames=300, size=(480, 640), fps=0.0, variants=16):
+        self.frames = frames
+        self.fps = fps
+        self.images = [self._image(size, i / variants) for i in range(variants)]
+        self.seq = 0
+        self.frame = None
+        self.running = False
+        self.started = 0.0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _image(size, phase):
+        height, width = size
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:] = np.linspace(40, 200, width, dtype=np.uint8)[None, :, None]
+        center = (int(width * (0.2 + 0.6 * phase)), height // 2)
+        cv2.circle(image, center, height // 6, (60, 120, 220), -1)
+        return image
+
+    def start(self):
+        self.running = True
+        self.started = time.monotonic()
+        return self
+
+    def stop(self):
+        self.running = False
+
+    def finished(self):
+        return self.seq >= self.frames
+
+    def read(self, after_seq=0, timeout=1.0):
+        with self.lock:
+            if not self.running or self.finished():
+                time.sleep(min(timeout, 0.01))
+                return None
+            if self.fps:
+                wait = self.started + self.seq / self.fps - time.monotonic()
+                if wait > 0:
+                    time.sleep(min(wait, timeout))
+            self.seq += 1
+            self.frame = Frame(self.images[self.seq % len(self.images)], time.monotonic(), self.seq)
+            return self.frame
+
+    def latest(self):
+        return self.frame
+
+
+class NullSocket:
+    """Stands in for Flask-SocketIO: counts emits and payload bytes instead of sending."""
+
+    def __init__(self):
+        self.emits = 0
+        self.bytes = 0
+
+    def emit(self, event, data=None, to=None):
+        self.emits += 1
+        for value in (data or {}).values():
+            if isinstance(value, (bytes, str)):
+                self.bytes += len(value)
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def percentiles(values):
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    ms = np.asarray(values) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"p50": round(float(p50), 2), "p95": round(float(p95), 2), "p99": round(float(p99), 2),
+            "mean": round(float(ms.mean()), 2), "max": round(float(ms.max()), 2)}
+
+
+def make_source(config):
+    if config["source"]:
+        return ReplaySource(config["source"], realtime=config["realtime"], use_cache=config["cached"]).start()
+    height, width = config["size"]
+    return SyntheticSource(config["frames"], (height, width), config["fps"]).start()
+
+
+def run_exercise(name, config):
+    """Benchmark one exercise and return its result dict."""
+    exercise = EXERCISES[name]()
+    options = engine.stream_options(config["stream"])
+    sink = NullSocket()
+    session = Session(f"benchmark-{name}", model_pool)
+
+    load_started = time.perf_counter()
+    model = session.model(exercise.model)
+    model.process(np.zeros((*config["size"], 3), dtype=np.uint8))
+    model_load = time.perf_counter() - load_started
+
+    latencies = []
+    clock = {"last_emit": 0.0}
+
+    def stages(s):
+        built = engine.engine_stages(s, sink, options)
+        capture, emit = built[0].fn, built[-1].fn
+
+        def timed_capture(packet):
+            packet = capture(packet)
+            if packet is not None:
+                packet["bench_started"] = time.perf_counter()
+            return packet
+
+        def timed_emit(packet):
+            packet = emit(packet)
+            clock["last_emit"] = time.perf_counter()
+            latencies.append(clock["last_emit"] - packet["bench_started"])
+            return packet
+
+        built[0].fn, built[-1].fn = timed_capture, timed_emit
+        return built
+
+    source = make_source(config)
+    cpu_started = time.process_time()
+    started = clock["last_emit"] = time.perf_counter()
+    session.start(exercise, stages, options, camera=source)
+    pipeline = session.pipeline
+
+    deadline = started + config["timeout"]
+    while time.perf_counter() < deadline:
+        time.sleep(0.05)
+        if source.finished() and time.perf_counter() - clock["last_emit"] > DRAIN_SECONDS:
+            break
+
+    session.close()
+    wall = max(clock["last_emit"] - started, 1e-9)
+    cpu = time.process_time() - cpu_started
+    stage_stats = {stage.name: {**stage.stats(), "total_s": round(stage.busy, 3)} for stage in pipeline.stages}
+
+    return {
+        "exercise": name,
+        "model": exercise.model,
+        "frames_in": pipeline.stages[0].processed,
+        "frames_out": len(latencies),
+        "dropped": sum(stats["dropped"] for stats in stage_stats.values()),
+        "wall_s": round(wall, 3),
+        "fps": round(len(latencies) / wall, 2),
+        "latency_ms": percentiles(latencies),
+        "cpu_s": round(cpu, 3),
+        "cpu_percent": round(cpu / wall * 100, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "model_load_s": round(model_load, 3),
+        "emitted_bytes": sink.bytes,
+        "stages": stage_stats,
+    }
+
+
+def run_memory(name, config):
+    """Steady-state allocations per frame for one exercise.
+
+    The stages run inline, so per-stage numbers are not blurred by other
+    threads; tracemalloc sees numpy (and so cv2 output) arrays as well as
+    Python objects.
+    """
+    exercise = EXERCISES[name]()
+    options = engine.stream_options(config["stream"])
+    session = Session(f"benchmark-{name}", model_pool)
+    session.model(exercise.model).process(np.zeros((*config["size"], 3), dtype=np.uint8))
+    session.exercise = exercise
+    session.camera = source = make_source(config)
+    stages = engine.engine_stages(session, NullSocket(), options)
+
+    peaks = {stage.name: [] for stage in stages}
+    collections = {"count": 0, "pauses": [], "started": None}
+
+    def on_gc(phase, info):
+        if phase == "start":
+            collections["started"] = time.perf_counter()
+        elif collections["started"] is not None:
+            collections["count"] += 1
+            collections["pauses"].append(time.perf_counter() - collections["started"])
+
+    frames = counted = 0
+    retained_start = None
+    tracemalloc.start()
+    try:
+        while not source.finished():
+            measuring = frames >= config["warmup"]
+            if measuring and retained_start is None:
+                gc.collect()
+                gc.callbacks.append(on_gc)
+                retained_start = tracemalloc.get_traced_memory()[0]
+            packet = {}
+            for stage in stages:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                packet = stage.fn(packet)
+                if measuring:
+                    peaks[stage.name].append(tracemalloc.get_traced_memory()[1] - before)
+                if packet is None:
+                    break
+            frames += 1
+            counted += measuring
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - retained_start if retained_start is not None else None
+    finally:
+        tracemalloc.stop()
+        if on_gc in gc.callbacks:
+            gc.callbacks.remove(on_gc)
+        for stage in stages:
+            if stage.close is not None:
+                stage.close()
+        session.close()
+
+    per_stage = {name: round(sum(values) / counted) if counted else None for name, values in peaks.items()}
+    pauses = percentiles(collections["pauses"])
+    return {
+        "exercise": name,
+        "model": exercise.model,
+        "frames": frames,
+        "measured_frames": counted,
+        "bytes_per_frame": sum(v for v in per_stage.values() if v is not None) if counted else None,
+        "stage_bytes_per_frame": per_stage,
+        "retained_bytes": retained,
+        "gc_collections": collections["count"],
+        "gc_pause_ms": {"p99": pauses["p99"], "max": pauses["max"]},
+        "buffers_bytes": sum(stage.buffers.nbytes() for stage in stages if stage.buffers is not None),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def environment():
+    """Machine and build details stored alongside the results."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        import mediapipe
+        mediapipe_version = mediapipe.__version__
+    except ImportError:
+        mediapipe_version = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "mediapipe": mediapipe_version,
+        "numpy": np.__version__,
+    }
+
+
+def run(names, config, isolate=True):
+    results = []
+    measure = run_memory if config["memory"] else run_exercise
+    for name in names:
+        print(f"📊 {name} ...", file=sys.stderr)
+        if isolate:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                result = pool.apply(measure, (name, config))
+        else:
+            result = measure(name, config)
+        if config["memory"]:
+            print(f"   {result['bytes_per_frame']} B/frame | retained {result['retained_bytes']} B | "
+                  f"{result['gc_collections']} GCs (max {result['gc_pause_ms']['max']} ms)", file=sys.stderr)
+        else:
+            latency = result["latency_ms"]
+            print(f"   {result['fps']} fps | p50 {latency['p50']} ms | p95 {latency['p95']} ms | "
+                  f"p99 {latency['p99']} ms | {result['cpu_percent']}% CPU | {result['peak_rss_mb']} MB",
+                  file=sys.stderr)
+        results.append(result)
+    return {"version": RESULTS_VERSION, "environment": environment(), "config": config, "results": results}
+
+
+def compare(report, baseline):
+    """Print fps and p95 latency changes against an earlier results file."""
+    previous = {result["exercise"]: result for result in baseline["results"]}
+    for result in report["results"]:
+        old = previous.get(result["exercise"])
+        if old is None or "fps" not in result or "fps" not in old:
+            continue
+        fps_change = (result["fps"] - old["fps"]) / old["fps"] * 100 if old["fps"] else 0.0
+        print(f"🔁 {result['exercise']}: {old['fps']} → {result['fps']} fps ({fps_change:+.1f}%), "
+              f"p95 {old['latency_ms']['p95']} → {result['latency_ms']['p95']} ms", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark exercise pipelines without a display or browser.")
+    parser.add_argument("-e", "--exercise", action="append", choices=sorted(EXERCISES),
+                        help="exercise to run (repeatable; default: all)")
+    parser.add_argument("--source", help="recording directory to replay instead of a synthetic clip")
+    parser.add_argument("--frames", type=int, default=300, help="synthetic clip length")
+    parser.add_argument("--size", default="640x480", help="synthetic frame size, WIDTHxHEIGHT")
+    parser.add_argument("--fps", type=float, default=0.0, help="pace synthetic frames (0 = unpaced)")
+    parser.add_argument("--realtime", action="store_true", help="replay recordings at their recorded pace")
+    parser.add_argument("--cached", action="store_true", help="use a recording's landmarks instead of the model")
+    parser.add_argument("--mode", choices=["video", "landmarks"], default="video")
+    parser.add_argument("--transport", choices=["base64", "binary"], default="base64")
+    parser.add_argument("--scale", type=float, default=1.0, help="inference_scale")
+    parser.add_argument("--roi", action="store_true")
+    parser.add_argument("--stride", type=int, default=1)
+    parser.add_argument("--adaptive", action="store_true", help="adaptive_stride")
+    parser.add_argument("--smooth", action="store_true")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per exercise")
+    parser.add_argument("--memory", action="store_true", help="measure allocations per frame instead of speed")
+    parser.add_argument("--warmup", type=int, default=MEMORY_WARMUP, help="frames ignored by --memory")
+    parser.add_argument("--no-isolate", action="store_true", help="run every exercise in this process")
+    parser.add_argument("-o", "--output", help="write JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    width, height = (int(v) for v in args.size.lower().split("x"))
+    config = {
+        "source": args.source,
+        "frames": args.frames,
+        "size": [height, width],
+        "fps": args.fps,
+        "realtime": args.realtime,
+        "cached": args.cached,
+        "timeout": args.timeout,
+        "memory": args.memory,
+        "warmup": args.warmup,
+        "stream": {
+            "mode": args.mode,
+            "transport": args.transport,
+            "inference_scale": args.scale,
+            "roi": args.roi,
+            "stride": args.stride,
+            "adaptive_stride": args.adaptive,
+            "smooth": args.smooth,
+            "history": False,
+        },
+    }
+    if args.source:
+        with open(os.path.join(args.source, META_FILE)) as f:
+            meta = json.load(f)
+        config["size"] = [meta["height"], meta["width"]]
+
+    report = run(args.exercise or list(EXERCISES), config, isolate=not args.no_isolate)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import threading
+
+# =====================================================
+# 📡 Encode Once, Fan Out to Viewers
+# =====================================================
+# Each session's JPEG is encoded once by its pipeline and published here
+# under a watch key. Any number of viewers read the newest frame:
+#   - MJPEG over HTTP (/watch/<key>.mjpg) for a plain <img> tag
+#   - socket observers, who join the session's watch room (watch_room) and
+#     get its frame emits; the patient's own sid room stays private
+# A viewer that falls behind just gets the newest frame next time; nothing
+# is queued per viewer.
+
+BOUNDARY = b"frame"
+MJPEG_MIMETYPE = "multipart/x-mixed-replace; boundary=frame"
+
+
+def watch_room(sid):
+    """Socket room of the observers watching session ``sid``."""
+    return f"watch:{sid}"
+
+
+class Broadcast:
+    """Newest encoded frame of one session."""
+
+    def __init__(self, sid):
+        self.sid = sid              # the patient's session
+        self.room = watch_room(sid)     # where observers receive its frames
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.jpeg = None
+        self.closed = False
+        self.viewers = 0
+
+    def publish(self, jpeg):
+        with self.cond:
+            self.seq += 1
+            self.jpeg = jpeg
+            self.cond.notify_all()
+
+    def wait(self, after_seq=0, timeout=5.0):
+        """``(seq, jpeg)`` newer than ``after_seq``, or None on timeout / close."""
+        with self.cond:
+            if self.seq <= after_seq and not self.closed:
+                self.cond.wait(timeout)
+            if self.seq <= after_seq or self.closed:
+                return None
+            return self.seq, self.jpeg
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def add_viewer(self, delta):
+        with self.cond:
+            self.viewers += delta
+
+
+class BroadcastHub:
+    """Broadcasts by watch key."""
+
+    def __init__(self):
+        self.broadcasts = {}
+        self.lock = threading.Lock()
+
+    def open(self, key, sid):
+        """New broadcast under ``key`` for session ``sid``.
+
+        Raises RuntimeError when another session's broadcast holds the key.
+        """
+        with self.lock:
+            broadcast = self.broadcasts.get(key)
+            if broadcast is not None:
+                if broadcast.sid != sid:
+                    raise RuntimeError(f"Watch key '{key}' is in use by another session")
+                broadcast.close()       # wake viewers of the previous pipeline
+            broadcast = self.broadcasts[key] = Broadcast(sid)
+            return broadcast
+
+    def get(self, key):
+        with self.lock:
+            return self.broadcasts.get(key)
+
+    def close(self, key, broadcast):
+        with self.lock:
+            if self.broadcasts.get(key) is broadcast:
+                del self.broadcasts[key]
+        broadcast.close()
+
+    def stats(self):
+        with self.lock:
+            return {key: {"viewers": b.viewers, "frames": b.seq} for key, b in self.broadcasts.items()}
+
+
+hub = BroadcastHub()
+
+
+def mjpeg_part(jpeg):
+    return (b"--" + BOUNDARY + b"\r\nContent-Type: image/jpeg\r\nContent-Length: "
+            + str(len(jpeg)).encode() + b"\r\n\r\n" + jpeg + b"\r\n")
+
+
+def mjpeg_stream(broadcast, timeout=5.0):
+    """Multipart MJPEG body; ends when the session's pipeline stops."""
+    broadcast.add_viewer(1)
+    try:
+        seq = 0
+        while True:
+            frame = broadcast.wait(seq, timeout)
+            if frame is None:
+                if broadcast.closed:
+                    return
+                continue
+            seq, jpeg = frame
+            yield mjpeg_part(jpeg)
+    finally:
+        broadcast.add_viewer(-1)
+
+
+def broadcast_stage(key, sid):
+    """Pipeline stage publishing ``packet["jpeg"]``; returns ``(fn, close)``."""
+    broadcast = hub.open(key, sid)
+
+    def publish(packet):
+        broadcast.publish(packet["jpeg"])
+        return packet
+
+    return publish, lambda: hub.close(key, broadcast)
@@ -0,0 +1,53 @@
+import cv2
+import numpy as np
+
+# =====================================================
+# ♻️ Reusable Frame Buffers
+# =====================================================
+# Per frame the hot path used to allocate a flipped copy, an RGB copy,
+# resized copies and so on, and under several sessions the allocator
+# churn showed up as periodic stalls. Stages now write into buffers from
+# a FrameBuffers ring instead (cv2's ``dst=`` argument or np.copyto).
+#
+# A buffer handed out is reused ``depth`` calls later, so ``depth`` must
+# exceed the number of packets that can still reference it: 1 for a
+# buffer used only inside one stage call, and Pipeline sets it for source
+# stages whose images travel down the whole pipeline.
+
+MAX_SHAPES = 4      # resolutions kept before older buffers are released
+
+
+class FrameBuffers:
+    """Round-robin ring of preallocated arrays per (shape, dtype)."""
+
+    def __init__(self, depth=1):
+        self.depth = depth
+        self.rings = {}
+        self.next = {}
+
+    def get(self, shape, dtype=np.uint8):
+        key = (tuple(shape), np.dtype(dtype).str)
+        ring = self.rings.get(key)
+        if ring is None:
+            if len(self.rings) >= MAX_SHAPES:
+                self.rings.clear()
+                self.next.clear()
+            ring = self.rings[key] = []
+            self.next[key] = 0
+
+        index = self.next[key]
+        self.next[key] = (index + 1) % self.depth
+        if index >= len(ring):
+            ring.append(np.empty(shape, dtype))     # rings fill up lazily
+        return ring[index]
+
+    def nbytes(self):
+        return sum(buffer.nbytes for ring in self.rings.values() for buffer in ring)
+
+
+def resize_into(image, scale, buffers):
+    """``image`` resized by ``scale`` into a reused buffer (INTER_AREA)."""
+    height, width = image.shape[:2]
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    out = buffers.get((size[1], size[0]) + image.shape[2:], image.dtype)
+    return cv2.resize(image, size, dst=out, interpolation=cv2.INTER_AREA)
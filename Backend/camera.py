@@ -0,0 +1,265 @@
+import threading
+import time
+from collections import Counter, deque, namedtuple
+
+import cv2
+
+# =====================================================
+# 🎥 Shared Camera Producer
+# =====================================================
+# One thread owns the capture device and reads at the camera's native
+# rate. Frames are published into a small ring buffer so any number of
+# consumers can pick up the newest frame without ever calling cap.read().
+#
+# Each frame is stamped with time.monotonic() right after the driver
+# hands it over (grab), before it is decoded (retrieve), so decode time
+# does not blur the timestamps that timing-sensitive exercises rely on.
+
+Frame = namedtuple("Frame", ["image", "timestamp", "seq"])
+
+# =====================================================
+# ⏱️ Capture Profiles
+# =====================================================
+# The default profile takes whatever the driver negotiates (often 30 fps
+# YUYV). "fast" asks for MJPG at the highest of ``fps`` the camera
+# accepts, with a one-frame driver buffer so frames are not held back.
+# Exercises name the profile they want (Exercise.capture_profile).
+#
+# A shared device runs the fastest profile any attached consumer asked
+# for. The driver's settings are read when the device opens, and
+# restored once no consumer wants a faster profile any more.
+CaptureProfile = namedtuple("CaptureProfile", ["fourcc", "fps", "width", "height", "buffer_size"])
+
+PROFILES = {
+    "default": None,
+    "fast": CaptureProfile("MJPG", (120, 90, 60), 640, 480, 1),
+}
+
+
+def apply_profile(cap, profile):
+    """Ask the driver for ``profile``; returns the fps it settled on.
+
+    Fields the driver did not report (0 or empty, see read_settings) are left alone.
+    """
+    if profile.fourcc.strip("\0"):
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+    if profile.width and profile.height:
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    if profile.buffer_size > 0:
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, profile.buffer_size)
+    for fps in profile.fps:
+        if fps <= 0:
+            continue
+        cap.set(cv2.CAP_PROP_FPS, fps)
+        if cap.get(cv2.CAP_PROP_FPS) >= fps - 1:
+            break
+    return cap.get(cv2.CAP_PROP_FPS)
+
+
+def read_settings(cap):
+    """The driver's current settings as a CaptureProfile, to restore later."""
+    code = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return CaptureProfile(
+        "".join(chr((code >> 8 * i) & 0xFF) for i in range(4)),
+        (cap.get(cv2.CAP_PROP_FPS),),
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        int(cap.get(cv2.CAP_PROP_BUFFERSIZE)),
+    )
+
+
+class CameraProducer:
+    """Reads a capture device continuously into a ring buffer."""
+
+    def __init__(self, device=0, buffer_size=4):
+        self.device = device
+        self.buffer = deque(maxlen=buffer_size)
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.cap = None
+        self.thread = None
+        self.running = False
+        self.consumers = 0              # sessions attached through get_camera
+        self.requests = Counter()       # profile name -> attached consumers asking for it
+        self.original = None            # driver settings read on open, restored for "default"
+        self.profile = "default"
+        self.pending_profile = None     # applied by the reader thread between frames
+        self.interval = None            # smoothed seconds between frames
+
+    def start(self):
+        """Open the device and start the reader thread (idempotent).
+
+        Raises RuntimeError when the device cannot be opened (missing or busy).
+        """
+        with self.cond:
+            if self.running:
+                return self
+            self.cap = cv2.VideoCapture(self.device)
+            if not self.cap.isOpened():
+                self.cap.release()
+                self.cap = None
+                raise RuntimeError(f"Camera {self.device} could not be opened")
+            self.buffer.clear()         # no stale frames from the previous run
+            self.interval = None
+            self.original = read_settings(self.cap)
+            self.profile = "default"
+            self._request_profile()
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name=f"camera-{self.device}", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop the reader thread and release the device."""
+        with self.cond:
+            if not self.running:
+                return
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join(timeout=2.0)
+        if self.profile != "default":
+            apply_profile(self.cap, self.original)     # leave the device as we found it
+        self.cap.release()
+        self.cap = None
+        self.thread = None
+
+    def attach(self, profile=None):
+        """Count one more consumer, wanting capture profile ``profile`` (None: "default")."""
+        with self.cond:
+            self.consumers += 1
+            self.requests[profile or "default"] += 1
+            self._request_profile()
+
+    def detach(self, profile=None):
+        """Forget one consumer attached with ``profile``; returns how many remain."""
+        with self.cond:
+            name = profile or "default"
+            if self.requests[name] > 0:
+                self.requests[name] -= 1
+            self.consumers = max(self.consumers - 1, 0)
+            self._request_profile()
+            return self.consumers
+
+    def _wanted_profile(self):
+        """The fastest profile (last in PROFILES) some consumer asked for."""
+        wanted = [name for name in PROFILES if self.requests[name] > 0]
+        return wanted[-1] if wanted else "default"
+
+    def _request_profile(self):
+        # Called with self.cond held; the reader thread switches between frames
+        name = self._wanted_profile()
+        self.pending_profile = name if name != self.profile else None
+
+    def _run(self):
+        while self.running:
+            if self.pending_profile is not None:
+                self._apply_pending_profile()
+            if not self.cap.grab():
+                time.sleep(0.01)
+                continue
+            timestamp = time.monotonic()
+            success, image = self.cap.retrieve()
+            if not success:
+                continue
+
+            with self.cond:
+                if self.buffer:
+                    interval = timestamp - self.buffer[-1].timestamp
+                    self.interval = interval if self.interval is None else 0.9 * self.interval + 0.1 * interval
+                self.seq += 1
+                self.buffer.append(Frame(image, timestamp, self.seq))
+                self.cond.notify_all()
+
+    def _apply_pending_profile(self):
+        with self.cond:
+            name, self.pending_profile = self.pending_profile, None
+            self.profile = name     # so a request arriving meanwhile compares against it
+        fps = apply_profile(self.cap, PROFILES[name] or self.original)
+        self.interval = None
+        print(f"🎥 Camera {self.device}: '{name}' profile, driver reports {fps:.0f} fps")
+
+    def stats(self):
+        return {
+            "profile": self.profile,
+            "fps": round(1.0 / self.interval, 1) if self.interval else None,
+        }
+
+    def latest(self):
+        """Newest frame in the buffer, or None before the first read."""
+        with self.cond:
+            return self.buffer[-1] if self.buffer else None
+
+    def read(self, after_seq=0, timeout=1.0):
+        """Block until a frame newer than ``after_seq`` exists and return the newest one.
+
+        Returns None on timeout or when the producer is stopped. Frames are
+        shared between consumers, so callers must not modify ``frame.image``
+        in place.
+        """
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while self.running and (not self.buffer or self.buffer[-1].seq <= after_seq):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self.cond.wait(remaining)
+            if not self.buffer or self.buffer[-1].seq <= after_seq:
+                return None
+            return self.buffer[-1]
+
+
+# =====================================================
+# 🧩 One producer per device
+# =====================================================
+# Consumers attach through get_camera and detach through release_camera;
+# the device is released when the last one detaches and reopened by the
+# next get_camera.
+_cameras = {}
+_cameras_lock = threading.Lock()
+
+
+def parse_device(value):
+    """Device argument from the command line: a camera index when numeric, else a path."""
+    return int(value) if str(value).isdigit() else value
+
+
+def get_camera(device=0, realtime=True, profile=None):
+    """Return the shared, started producer for ``device``.
+
+    ``profile`` names the entry of PROFILES this consumer wants; pass the
+    same name to release_camera.
+    ``device`` may also be a recording directory (see recording.py); each
+    call then gets its own ReplaySource, paced in real time or not.
+    """
+    from recording import ReplaySource, is_recording
+
+    if is_recording(device):
+        return ReplaySource(device, realtime=realtime).start()
+
+    with _cameras_lock:
+        camera = _cameras.get(device)
+        if camera is None:
+            camera = _cameras[device] = CameraProducer(device)
+        camera.attach(profile)
+        try:
+            camera.start()
+        except RuntimeError:
+            camera.detach(profile)
+            raise
+    return camera
+
+
+def release_camera(camera, profile=None):
+    """Detach one consumer (attached with ``profile``) from a source returned by get_camera.
+
+    Replays and other exclusive sources are stopped right away; a shared
+    producer goes back to the profile its remaining consumers want and is
+    stopped once its last consumer detaches.
+    """
+    if getattr(camera, "exclusive", False):
+        camera.stop()
+        return
+    with _cameras_lock:
+        if camera.detach(profile) == 0:
+            camera.stop()
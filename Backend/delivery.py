@@ -0,0 +1,147 @@
+import threading
+import time
+
+# =====================================================
+# 🎚️ Ack-Driven Delivery Control
+# =====================================================
+# Clients that opt in ("ack": true) answer every frame with a frame_ack
+# carrying its seq. From those acks we know how old a frame is when the
+# client gets it, and step JPEG quality, output size and emit rate down
+# (or back up) to keep that age under a target. A frame takes one of
+# ``max_in_flight`` slots when the pace stage admits it and holds it until
+# acked, timed out or dropped before sending, so a slow client never
+# builds a backlog. Inference keeps its own rate; skipped frames
+# only skip render/encode/emit and the next emit carries the newest
+# counts.
+
+# (JPEG quality, output scale, max emit fps), best first
+LEVELS = [
+    (85, 1.0, 30),
+    (75, 1.0, 30),
+    (65, 1.0, 24),
+    (55, 0.75, 24),
+    (50, 0.75, 15),
+    (45, 0.5, 15),
+    (40, 0.5, 10),
+    (35, 0.5, 5),
+]
+
+
+class DeliveryControl:
+    """Per-client quality / size / rate ladder driven by frame acks."""
+
+    def __init__(self, target_age=0.25, max_in_flight=2, ack_timeout=2.0,
+                 adjust_every=1.0, levels=LEVELS, start_level=1):
+        self.target_age = target_age        # seconds from capture to client receipt
+        self.max_in_flight = max_in_flight
+        self.ack_timeout = ack_timeout      # unacked this long counts as lost
+        self.adjust_every = adjust_every    # seconds between level changes
+        self.levels = levels
+        self.level = start_level
+        self.in_flight = {}                 # seq -> capture timestamp, from admission to ack
+        self.sent_at = {}                   # seq -> admission, then send time
+        self.last_sent = 0.0
+        self.last_change = 0.0
+        self.age = None                     # smoothed frame age at the client
+        self.lost = 0
+        self.lock = threading.Lock()
+
+    @property
+    def quality(self):
+        return self.levels[self.level][0]
+
+    @property
+    def scale(self):
+        return self.levels[self.level][1]
+
+    @property
+    def fps(self):
+        return self.levels[self.level][2]
+
+    def reserve(self, seq, captured, now=None):
+        """Take a slot for frame ``seq`` if it may be rendered and sent now; returns False if not.
+
+        A reserved frame must end in sent() or release().
+        """
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            expired = [seq for seq, sent in self.sent_at.items() if now - sent > self.ack_timeout]
+            for expired_seq in expired:
+                self._forget(expired_seq)
+            if expired:
+                self.lost += len(expired)
+                self._step(+1, now)
+            if len(self.in_flight) >= self.max_in_flight or now - self.last_sent < 1.0 / self.fps:
+                return False
+            self.in_flight[seq] = captured
+            self.sent_at[seq] = now
+            self.last_sent = now
+            return True
+
+    def sent(self, seq, now=None):
+        """Frame ``seq`` went out; its ack timeout runs from now."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            if seq in self.in_flight:
+                self.sent_at[seq] = now
+
+    def release(self, seq):
+        """Free the slot of frame ``seq``, dropped after reserve() and never sent."""
+        with self.lock:
+            self._forget(seq)
+
+    def ack(self, seq, now=None):
+        """Client got frame ``seq`` (and, in order, everything before it)."""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            captured = self.in_flight.get(seq)
+            if captured is None:
+                return
+            for earlier in [s for s in self.in_flight if s <= seq]:
+                self._forget(earlier)
+
+            age = now - captured
+            self.age = age if self.age is None else 0.7 * self.age + 0.3 * age
+            if self.age > self.target_age:
+                self._step(+1, now)
+            elif self.age < 0.6 * self.target_age:
+                self._step(-1, now)
+
+    def _forget(self, seq):
+        self.in_flight.pop(seq, None)
+        self.sent_at.pop(seq, None)
+
+    def _step(self, direction, now):
+        level = min(max(self.level + direction, 0), len(self.levels) - 1)
+        if level != self.level and now - self.last_change >= self.adjust_every:
+            self.level = level
+            self.last_change = now
+
+    def stats(self):
+        with self.lock:
+            return {
+                "level": self.level,
+                "quality": self.quality,
+                "scale": self.scale,
+                "fps": self.fps,
+                "age_ms": round(self.age * 1000, 1) if self.age is not None else None,
+                "in_flight": len(self.in_flight),
+                "lost": self.lost,
+            }
+
+
+def pace_stage(control):
+    """Drop packets the client cannot take yet, before render/encode.
+
+    Admitted packets carry a ``release`` callback that frees their slot if
+    a later stage or queue drops them (pipeline.discard).
+    """
+
+    def pace(packet):
+        seq = packet["seq"]
+        if not control.reserve(seq, packet["timestamp"]):
+            return None
+        packet["release"] = lambda: control.release(seq)
+        return packet
+
+    return pace
@@ -0,0 +1,346 @@
+import os
+
+import cv2
+
+import features
+from broadcast import broadcast_stage, watch_room
+from buffers import FrameBuffers
+from camera import get_camera, release_camera
+from delivery import DeliveryControl, pace_stage
+from exercises import EXERCISES
+from filters import LandmarkSmoother
+from history import get_store, history_stage
+from landmarks import landmark_payload
+from models import MODEL_FACTORIES, landmark_groups
+from motion import GATE_BY_DEFAULT, MotionGate
+from overlay import draw_overlay
+from pipeline import Stage, capture_stage, discard, encode_stage, wants_binary, wants_landmarks
+from recording import Recorder, is_recording, recording_path
+from roi import InferenceRegion
+from scheduler import ModelScheduler, run_model
+
+# =====================================================
+# ⚙️ Exercise Engine
+# =====================================================
+# One pipeline per session runs whatever exercise plugin is current:
+# capture → inference → render/encode (or landmark pack) → emit.
+# Switching exercises swaps the plugin on the running pipeline, so the
+# camera and the warmed-up model stay as they are.
+
+# Model names the React overlay understands
+OVERLAY_MODEL = {"hands": "hand", "pose": "pose", "face_mesh": "face"}
+
+# Camera indices a client may open. Files and stream URLs are for run_local only.
+CAMERAS = {int(index) for index in os.environ.get("MOTIONAID_CAMERAS", "0").split(",") if index.strip()}
+
+
+def client_device(value):
+    """Camera index from a start event; raises RuntimeError unless it is in CAMERAS."""
+    if isinstance(value, bool) or not isinstance(value, int) or value not in CAMERAS:
+        raise RuntimeError(f"Camera {value!r} is not available")
+    return value
+
+
+# Accepted ranges for numeric start options; values outside are clamped
+SCALE_RANGE = (0.1, 1.0)
+STRIDE_RANGE = (1, 10)
+
+
+def replay_device(name):
+    """Recording directory for a start event's ``replay`` name; raises RuntimeError if there is none."""
+    path = recording_path(name)
+    if not is_recording(path):
+        raise RuntimeError(f"No recording named {name!r}")
+    return path
+
+
+def number_option(data, key, default, cast, bounds):
+    """``data[key]`` converted with ``cast`` and clamped to ``bounds``; raises RuntimeError if not a number."""
+    try:
+        value = cast(data.get(key, default))
+    except (TypeError, ValueError, OverflowError):
+        raise RuntimeError(f"{key} must be a number") from None
+    if value != value:      # NaN
+        raise RuntimeError(f"{key} must be a number")
+    low, high = bounds
+    return min(max(value, low), high)
+
+
+def stream_options(data):
+    """Pipeline-shaping options from a client's start event.
+
+    ``record`` and ``replay`` name recordings under recording.RECORDINGS_DIR;
+    a replay stands in for the camera. Raises RuntimeError for a camera
+    the client may not open, a bad recording name, a missing replay and a
+    non-numeric inference_scale or stride; numbers are clamped to range.
+    """
+    data = data or {}
+    replay, record = data.get("replay"), data.get("record")
+    if replay and record and replay == record:
+        raise RuntimeError("A recording cannot be replayed and recorded at once")
+    return {
+        "binary": wants_binary(data),
+        "landmarks": wants_landmarks(data),
+        "device": replay_device(replay) if replay else client_device(data.get("device", 0)),
+        "scale": number_option(data, "inference_scale", 1.0, float, SCALE_RANGE),
+        "roi": bool(data.get("roi", False)),
+        "stride": number_option(data, "stride", 1, int, STRIDE_RANGE),
+        "adaptive": bool(data.get("adaptive_stride", False)),
+        "smooth": bool(data.get("smooth", False)),
+        "realtime": data.get("replay_speed", "realtime") != "fast",
+        "record": recording_path(record) if record else None,
+        "patient": str(data.get("patient", "anonymous")),
+        "history": bool(data.get("history", True)),
+        "motion_gate": bool(data.get("motion_gate", GATE_BY_DEFAULT)),
+        "watch_key": data.get("watch_key"),
+        "ack": bool(data.get("ack", False)),
+        "profile": data.get("capture_profile"),     # None: the exercise's own
+        "holistic": data.get("holistic"),           # None: when cheaper (scheduler.py)
+    }
+
+
+def infer_stage(session, region=None, smoother=None, holistic=None):
+    """Run the current exercise's model and update its counters.
+
+    ``region`` (an InferenceRegion) optionally downscales the model input
+    or crops it around the previous landmarks. ``smoother`` (a
+    LandmarkSmoother) filters landmarks and may skip inference on some
+    frames, predicting them instead. Frames the motion gate marked static
+    reuse the previous frame's landmarks and payload.
+
+    Exercises with a ``schedule`` run their models through a
+    scheduler.ModelScheduler instead; ``packet["models"]`` then holds
+    every model's arrays and the exercise's own ``model`` stays the one
+    in ``packet["arrays"]``. ``holistic`` is passed on to the scheduler.
+    """
+    region = region or InferenceRegion()
+    smoother = smoother or LandmarkSmoother(smooth=False)
+    current = {"exercise": None, "last": None, "scheduler": None}
+    rgb_buffers = FrameBuffers()
+
+    def infer(packet):
+        exercise = session.exercise
+        if exercise is None:
+            return None
+        if exercise is not current["exercise"]:
+            region.reset()
+            smoother.reset()
+            current["exercise"] = exercise
+            current["last"] = None
+            current["scheduler"] = (ModelScheduler(exercise, holistic, session.pool.factories)
+                                    if exercise.schedule else None)
+
+        if packet.get("static") and current["last"] is not None:
+            packet["arrays"], packet["models"], packet["payload"] = current["last"]
+            packet["exercise"] = exercise
+            packet["inferred"] = False
+            packet["reused"] = True
+            return packet
+
+        scheduler = current["scheduler"]
+        cached = None
+        if scheduler is None and hasattr(session.camera, "cached_landmarks"):
+            cached = session.camera.cached_landmarks(packet["seq"], exercise.model)
+
+        if cached is not None:
+            # Replaying a recording with landmarks from this model: no inference
+            arrays = smoother.update(cached, packet["timestamp"])
+            packet["inferred"] = False
+        elif scheduler is not None:
+            due = scheduler.due(exercise, packet["timestamp"])
+            rgb = None
+            if due:
+                image = packet["image"]
+                rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_buffers.get(image.shape, image.dtype))
+            results = scheduler.run(session, rgb, due, packet["timestamp"]) if due else dict(scheduler.last)
+            arrays = results[exercise.model]
+            packet["models"] = results
+            packet["inferred"] = bool(due)
+        elif smoother.should_infer():
+            image = packet["image"]
+            rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_buffers.get(image.shape, image.dtype))
+            arrays = run_model(session.model(exercise.model), exercise.model, rgb,
+                               region, smoother, packet["timestamp"])
+            if arrays is None:
+                return None     # the inference worker skipped this frame
+            packet["inferred"] = True
+        else:
+            arrays = smoother.predict(packet["timestamp"])
+            packet["inferred"] = False
+
+        packet["exercise"] = exercise
+        packet["arrays"] = arrays
+        packet["payload"] = exercise.update(arrays, packet)
+        current["last"] = (arrays, packet.get("models"), packet["payload"])
+        return packet
+
+    return infer
+
+
+def record_stage(recorder):
+    """Save the clean (mirrored, not yet drawn on) frame and its landmarks."""
+
+    def record(packet):
+        recorder.write(packet["image"], packet["timestamp"], packet["exercise"].model, packet["arrays"])
+        return packet
+
+    return record
+
+
+def render_stage(packet):
+    if packet.get("reused"):
+        return packet   # the encode stage resends the previous JPEG
+    exercise = packet["exercise"]
+    style = exercise.overlay_style(packet["payload"])
+    for kind, arrays in (packet.get("models") or {exercise.model: packet["arrays"]}).items():
+        draw_overlay(packet["image"], kind, arrays, style)
+    exercise.render(packet["image"], packet["payload"])
+    return packet
+
+
+def pack_stage(packet):
+    """Replace render + encode: attach packed landmarks to the payload."""
+    model = OVERLAY_MODEL[packet["exercise"].model]
+    packet["payload"] = {**packet["payload"], **landmark_payload(packet["arrays"], model)}
+    return packet
+
+
+def emit_stage(socketio, to=None, control=None, watchers=None):
+    """Send the encoded frame (if any) plus the payload on the exercise's event.
+
+    ``to`` limits the emit to one client's room (its sid); ``watchers``
+    names a second room (broadcast.watch_room) that gets the same frames
+    without any of the client's other events. With a
+    ``control`` (delivery.DeliveryControl) frames carry their ``seq`` for
+    the client to ack and pacing is left to the control instead of the
+    exercise's fixed interval. Frames go through ``socketio.emit_frame``
+    where the server has one (async_app.AsyncEmitter drops them on backlog).
+    """
+    send = getattr(socketio, "emit_frame", socketio.emit)
+
+    def emit(packet):
+        exercise = packet["exercise"]
+        data = dict(packet["payload"])
+        if "encoded" in packet:
+            data[exercise.frame_key] = packet["encoded"]
+        if control is not None:
+            data["seq"] = packet["seq"]
+        if send(exercise.event, data, to=to) is False:
+            discard(packet)     # dropped on send backlog: free its delivery slot
+        elif control is not None:
+            control.sent(packet["seq"])
+        if watchers is not None:
+            send(exercise.event, data, to=watchers)
+        if exercise.interval and control is None:
+            socketio.sleep(exercise.interval)
+        return packet
+
+    return emit
+
+
+def watch_key(session, options):
+    """Key viewers use to watch this session (default: its socket sid)."""
+    return str(options["watch_key"] or session.sid)
+
+
+def engine_stages(session, socketio, options):
+    frames = FrameBuffers()
+    gate = MotionGate() if options["motion_gate"] else None
+    stages = [
+        Stage("capture", capture_stage(session.camera, gate=gate, buffers=frames), buffers=frames),
+        Stage("inference", infer_stage(
+            session,
+            InferenceRegion(options["scale"], options["roi"]),
+            LandmarkSmoother(options["stride"], options["adaptive"], options["smooth"]),
+            options["holistic"],
+        )),
+    ]
+    if options["record"]:
+        recorder = Recorder(options["record"])
+        stages.append(Stage("record", record_stage(recorder), close=recorder.close))
+    store = get_store() if options["history"] else None
+    if store is not None:
+        record, close = history_stage(store, options["patient"])
+        stages.append(Stage("history", record, close=close))
+    control = session.delivery = DeliveryControl() if options["ack"] else None
+    if control is not None:
+        stages.append(Stage("pace", pace_stage(control)))
+    watchers = None
+    if options["landmarks"]:
+        stages.append(Stage("pack", pack_stage))
+    else:
+        stages.append(Stage("render", render_stage))
+        stages.append(Stage("encode", encode_stage(options["binary"], control)))
+        publish, close = broadcast_stage(watch_key(session, options), session.sid)
+        stages.append(Stage("broadcast", publish, close=close))
+        watchers = watch_room(session.sid)
+    stages.append(Stage("emit", emit_stage(socketio, to=session.sid, control=control, watchers=watchers)))
+    return stages
+
+
+def start(session, socketio, name, data=None):
+    """Start (or switch to) exercise ``name`` in ``session``.
+
+    Raises KeyError for an unknown exercise and RuntimeError for invalid
+    options (see stream_options), when no model is free in the pool or
+    another session holds the requested watch key.
+    """
+    exercise = EXERCISES[name]()
+    options = stream_options(data)
+    options["profile"] = options["profile"] or exercise.capture_profile
+    kinds = [exercise.model]
+    if exercise.schedule:
+        # Holistic may replace the exercise's own model, so borrow what the schedule runs
+        kinds = ModelScheduler(exercise, options["holistic"], session.pool.factories).model_kinds
+    for kind in kinds:
+        session.model(kind)     # a full pool fails here and not in the pipeline
+
+    def on_error(stage, error):
+        # The pipeline has stopped itself; tell the client instead of freezing its frame
+        socketio.emit("session_error", {"exercise": name, "stage": stage.name, "error": str(error) or repr(error)},
+                      to=session.sid)
+
+    session.start(exercise, lambda s: engine_stages(s, socketio, options), options, on_error=on_error)
+    return exercise
+
+
+# =====================================================
+# 🖥️ Local window runner (no server)
+# =====================================================
+def run_local(exercise, title, device=0, patient="local"):
+    """Run one exercise against a local camera (or recording) in an OpenCV window; 'q' quits.
+
+    Sessions, reps and samples go to the history store like server sessions.
+    """
+    camera = get_camera(device, profile=exercise.capture_profile)
+    model = MODEL_FACTORIES[exercise.model]()
+    capture = capture_stage(camera)
+    store = get_store()
+    record_history, close_history = history_stage(store, patient) if store is not None else (None, None)
+
+    while True:
+        packet = capture({})
+        if packet is None:
+            if getattr(camera, "exclusive", False):
+                break   # end of recording
+            continue
+
+        results = model.process(cv2.cvtColor(packet["image"], cv2.COLOR_BGR2RGB))
+        groups = landmark_groups(exercise.model, results)
+        packet["exercise"] = exercise
+        packet["arrays"] = features.to_arrays(exercise.model, groups)
+        packet["payload"] = exercise.update(packet["arrays"], packet)
+        if record_history is not None:
+            record_history(packet)
+        render_stage(packet)
+
+        cv2.imshow(title, packet["image"])
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+    release_camera(camera, exercise.capture_profile)
+    model.close()
+    if store is not None:
+        close_history()
+        store.close()
+    cv2.destroyAllWindows()
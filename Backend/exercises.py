@@ -0,0 +1,301 @@
+from types import MappingProxyType
+
+import cv2
+
+import features
+from overlay import DEFAULT_STYLE, HAND_STATE_STYLES
+
+# =====================================================
+# 🏋️ Exercise Plugins
+# =====================================================
+# Each exercise declares the model it needs and the socket event it
+# emits on, and turns per-frame landmark arrays into counters. The engine
+# (engine.py) owns the camera, models, drawing and transport.
+
+
+class Exercise:
+    """Base plugin: override ``reset``, ``update`` and optionally ``render``."""
+
+    name = ""
+    model = "hands"        # key into models.MODEL_FACTORIES
+    # Further models → rate in Hz (None = every frame, 0 = on demand), see
+    # scheduler.py. Read-only, so subclasses assign their own mapping.
+    schedule = MappingProxyType({})
+    event = ""             # socket event carrying frames/payload
+    frame_key = "frame"    # payload key of the encoded frame
+    interval = 0.0         # pause after each emit, in seconds
+    capture_profile = "default"     # camera.PROFILES entry the exercise wants
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        pass
+
+    def update(self, groups, packet):
+        """Consume landmark arrays for one frame and return the payload dict."""
+        raise NotImplementedError
+
+    def wants(self, kind):
+        """True while an on-demand (rate 0) model in ``schedule`` should run."""
+        return False
+
+    def overlay_style(self, payload):
+        """overlay.Style for this frame's landmarks (return a cached one)."""
+        return DEFAULT_STYLE
+
+    def render(self, image, payload):
+        """Draw exercise text onto the (already landmark-annotated) frame."""
+
+
+# =====================================================
+# ✋ Hand Open-Close
+# =====================================================
+class OpenClose(Exercise):
+    name = "openclose"
+    model = "hands"
+    event = "video_feed"
+
+    def reset(self):
+        self.count = 0
+        self.hand_state_prev = "Unknown"
+
+    def update(self, groups, packet):
+        hand_state = "No Hand"
+        for points in groups:
+            hand_state = features.hand_state(points)
+            if self.hand_state_prev == "Fully Closed" and hand_state == "Fully Open":
+                self.count += 1
+            self.hand_state_prev = hand_state
+        return {"count": self.count, "state": hand_state}
+
+    def overlay_style(self, payload):
+        return HAND_STATE_STYLES.get(payload["state"], DEFAULT_STYLE)
+
+    def render(self, image, payload):
+        cv2.putText(image, f"State: {payload['state']}", (30, 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 2)
+        cv2.putText(image, f"Count: {payload['count']}", (30, 80),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
+
+
+# =====================================================
+# 🔄 Wrist Rotation
+# =====================================================
+class Rotation(Exercise):
+    name = "rotation"
+    model = "hands"
+    event = "rotation_feed"
+    frame_key = "image"
+
+    def reset(self):
+        self.count = 0
+        self.previous_angle = None
+        self.rotated_once = False
+
+    def update(self, groups, packet):
+        for points in groups:
+            angle = features.wrist_angle(points)
+
+            if self.previous_angle is not None:
+                diff = angle - self.previous_angle
+                if diff > 180: diff -= 360
+                if diff < -180: diff += 360
+
+                if abs(diff) > 30 and not self.rotated_once:
+                    self.count += 1
+                    self.rotated_once = True
+                elif abs(diff) < 10:
+                    self.rotated_once = False
+
+            self.previous_angle = angle
+        angle = round(self.previous_angle, 1) if self.previous_angle is not None else None
+        return {"count": self.count, "angle": angle}
+
+    def render(self, image, payload):
+        cv2.putText(image, f"Rotations: {payload['count']}", (30, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 2)
+
+
+# =====================================================
+# 🙌 Join Hands Above Head (REPS)
+# =====================================================
+class JoinHands(Exercise):
+    name = "joinhands"
+    model = "pose"
+    event = "joinhands_feed"
+    interval = 0.03
+
+    def reset(self):
+        self.rep_count = 0
+        self.hands_above = False
+        self.accuracy = 0
+
+    def update(self, groups, packet):
+        for points in groups:
+            ear_y = points[[features.LEFT_EAR, features.RIGHT_EAR], 1].mean()
+            avg_y = points[[features.LEFT_INDEX, features.RIGHT_INDEX], 1].mean()
+            self.accuracy = features.proximity_accuracy(points, features.LEFT_INDEX, features.RIGHT_INDEX)
+
+            if avg_y < ear_y and not self.hands_above:
+                self.hands_above = True
+
+            elif avg_y > ear_y + 0.08 and self.hands_above:
+                if self.accuracy >= 80:
+                    self.rep_count += 1
+                self.hands_above = False
+        return {"count": self.rep_count, "accuracy": self.accuracy}
+
+
+# =====================================================
+# 👆 Finger Tap (thumb to each fingertip in turn)
+# =====================================================
+FINGER_NAMES = ["Index", "Middle", "Ring", "Pinky"]
+
+
+# Tap onset and offset are placed where the thumb-to-target distance
+# crossed touch_px, interpolated between the capture timestamps of the two
+# frames around the crossing, so durations are not quantized to the frame
+# interval. The "fast" capture profile narrows that interval further.
+class FingerTap(Exercise):
+    name = "fingertap"
+    model = "hands"
+    event = "fingertap_feed"
+    capture_profile = "fast"
+    touch_px = 40    # thumb-to-fingertip distance that counts as touching
+
+    def reset(self):
+        self.target = 0
+        self.tap_start = None
+        self.taps = []
+        self.summary = []
+        self.count = 0
+        self.previous = None    # (timestamp, fingertip distances) of the last frame with a hand
+
+    def update(self, groups, packet):
+        height, width = packet["size"]
+        timestamp = packet["timestamp"]
+        for points in groups[:1]:
+            tip_dists = features.distances_from(points[:, :2] * (width, height),
+                                                features.THUMB_TIP, features.FINGER_TIPS)
+            others = [d for i, d in enumerate(tip_dists) if i != self.target]
+            touching = tip_dists[self.target] < self.touch_px and all(d >= self.touch_px for d in others)
+
+            if touching:
+                if self.tap_start is None:
+                    self.tap_start = self.crossing(timestamp, tip_dists)
+            elif self.tap_start is not None:
+                self.finish_tap(self.crossing(timestamp, tip_dists) - self.tap_start)
+            self.previous = (timestamp, tip_dists)
+        if not groups:
+            self.previous = None    # do not interpolate across frames without a hand
+
+        return {
+            "target": FINGER_NAMES[self.target],
+            "taps": list(self.taps),
+            "summary": self.summary,
+            "count": self.count,
+        }
+
+    def crossing(self, timestamp, tip_dists):
+        """Time the target distance crossed ``touch_px`` (this frame's time if it did not)."""
+        if self.previous is None:
+            return timestamp
+        before, after = self.previous[1][self.target], tip_dists[self.target]
+        if (before < self.touch_px) == (after < self.touch_px):
+            return timestamp    # state changed because of another finger
+        fraction = float((before - self.touch_px) / (before - after))
+        return self.previous[0] + fraction * (timestamp - self.previous[0])
+
+    def finish_tap(self, duration):
+        self.taps.append({"finger": FINGER_NAMES[self.target], "duration": round(duration, 3)})
+        self.tap_start = None
+        self.target += 1
+        if self.target >= len(FINGER_NAMES):
+            self.summary = self.taps
+            self.taps = []
+            self.target = 0
+            self.count += 1
+
+    def render(self, image, payload):
+        cv2.putText(image, f"Target: {payload['target']}", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2)
+        for i, tap in enumerate(payload["summary"]):
+            cv2.putText(image, f"{tap['finger']}: {tap['duration']:.2f} sec", (10, 70 + 30 * i),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
+
+
+# =====================================================
+# 💪 Arm Raise (side / front)
+# =====================================================
+class ArmRaise(Exercise):
+    name = "armraise"
+    model = "pose"
+    event = "armraise_feed"
+
+    # Frames are mirrored before inference, so MediaPipe's RIGHT_* points
+    # are the patient's left arm.
+    SHOULDER = features.RIGHT_SHOULDER
+    ELBOW = features.RIGHT_ELBOW
+    WRIST = features.RIGHT_WRIST
+    HIP = features.RIGHT_HIP
+
+    def reset(self):
+        self.count = 0
+        self.raised = False
+        self.angle = 0
+        self.direction = "Down"
+
+    def update(self, groups, packet):
+        for points in groups:
+            shoulder = points[self.SHOULDER]
+            wrist = points[self.WRIST]
+
+            self.angle = int(features.angle(points, self.HIP, self.SHOULDER, self.ELBOW))
+            height_diff = shoulder[1] - wrist[1]  # Positive if hand is above shoulder
+
+            if abs(shoulder[0] - wrist[0]) > abs(shoulder[2] - wrist[2]):
+                self.direction = "Side Raise"
+            else:
+                self.direction = "Front Raise"
+
+            if height_diff > 0.05:
+                self.raised = True
+            elif self.raised:
+                self.count += 1
+                self.raised = False
+
+        return {"count": self.count, "angle": self.angle,
+                "direction": self.direction, "raised": self.raised}
+
+    def render(self, image, payload):
+        if payload["raised"]:
+            cv2.putText(image, f"{payload['direction']} | Angle: {payload['angle']}", (10, 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,0), 2)
+        else:
+            cv2.putText(image, "Lowered", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
+
+
+# =====================================================
+# 😎 Face Mesh "virtual glasses"
+# =====================================================
+class FaceMesh(Exercise):
+    name = "facemesh"
+    model = "face_mesh"
+    event = "facemesh_feed"
+
+    def update(self, groups, packet):
+        height, width = packet["size"]
+        eyes = []
+        for points in groups:
+            left = points[features.LEFT_EYE_OUTER, :2] * (width, height)
+            right = points[features.RIGHT_EYE_OUTER, :2] * (width, height)
+            eyes.append([int(left[0]), int(left[1]), int(right[0]), int(right[1])])
+        return {"faces": len(groups), "eyes": eyes}
+
+    def render(self, image, payload):
+        for lx, ly, rx, ry in payload["eyes"]:
+            cv2.rectangle(image, (lx-30, ly-20), (rx+30, ry+20), (0,255,255), 3)
+
+
+EXERCISES = {cls.name: cls for cls in (OpenClose, Rotation, JoinHands, FingerTap, ArmRaise, FaceMesh)}
@@ -0,0 +1,122 @@
+import numpy as np
+
+# =====================================================
+# 📐 Landmark Feature Library
+# =====================================================
+# Every exercise converts its landmark list to an (N, 3) array once per
+# frame (pose keeps a fourth, visibility column for drawing) and computes all features from that array in batched NumPy form,
+# instead of walking landmarks.landmark[i].x point by point.
+
+# Hand landmark indices
+WRIST = 0
+THUMB_TIP = 4
+MIDDLE_MCP = 9
+FINGER_TIPS = np.array([8, 12, 16, 20])    # Index, Middle, Ring, Pinky
+FINGER_PIPS = FINGER_TIPS - 2
+
+# Pose landmark indices
+LEFT_EAR = 7
+RIGHT_EAR = 8
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_ELBOW = 13
+RIGHT_ELBOW = 14
+LEFT_WRIST = 15
+RIGHT_WRIST = 16
+LEFT_INDEX = 19
+RIGHT_INDEX = 20
+LEFT_HIP = 23
+RIGHT_HIP = 24
+
+# Face mesh landmark indices
+LEFT_EYE_OUTER = 33
+RIGHT_EYE_OUTER = 263
+
+# (a, b, c) triplets: the angle is measured at b
+HAND_JOINTS = np.array([
+    (0, 1, 2), (1, 2, 3), (2, 3, 4),          # Thumb CMC, MCP, IP
+    (0, 5, 6), (5, 6, 7), (6, 7, 8),          # Index MCP, PIP, DIP
+    (0, 9, 10), (9, 10, 11), (10, 11, 12),    # Middle
+    (0, 13, 14), (13, 14, 15), (14, 15, 16),  # Ring
+    (0, 17, 18), (17, 18, 19), (18, 19, 20),  # Pinky
+])
+
+HAND_STATES = ("Fully Open", "Half Closed", "Fully Closed")
+
+
+def to_array(landmarks, with_visibility=False):
+    """(N, 3) float32 array (or (N, 4) with visibility) from a landmark list.
+
+    Arrays are passed through unchanged, so callers that already hold
+    arrays (e.g. from the process-pool backend) pay nothing.
+    """
+    if isinstance(landmarks, np.ndarray):
+        return landmarks if with_visibility else landmarks[:, :3]
+    points = landmarks.landmark
+    if with_visibility:
+        return np.array([(p.x, p.y, p.z, p.visibility) for p in points], dtype=np.float32)
+    return np.array([(p.x, p.y, p.z) for p in points], dtype=np.float32)
+
+
+def to_arrays(kind, groups):
+    """Arrays for every landmark group of a model; pose keeps its visibility column."""
+    return [to_array(g, with_visibility=(kind == "pose")) for g in groups]
+
+
+def finger_curl(points):
+    """Boolean per finger (index..pinky): tip is below its PIP joint."""
+    return points[FINGER_TIPS, 1] > points[FINGER_PIPS, 1]
+
+
+def hand_state(points):
+    """'Fully Open', 'Half Closed' or 'Fully Closed' from the curl mask."""
+    curled = int(finger_curl(points).sum())
+    if curled == 0:
+        return "Fully Open"
+    if curled == len(FINGER_TIPS):
+        return "Fully Closed"
+    return "Half Closed"
+
+
+def joint_angles(points, joints=HAND_JOINTS):
+    """Angle in degrees (0-180) at the middle point of every (a, b, c) triplet, in the x/y plane."""
+    a = points[joints[:, 0], :2]
+    b = points[joints[:, 1], :2]
+    c = points[joints[:, 2], :2]
+    radians = (np.arctan2(c[:, 1] - b[:, 1], c[:, 0] - b[:, 0])
+               - np.arctan2(a[:, 1] - b[:, 1], a[:, 0] - b[:, 0]))
+    angles = np.abs(np.degrees(radians))
+    return np.where(angles > 180.0, 360.0 - angles, angles)
+
+
+def angle(points, a, b, c):
+    """Single joint angle at ``b``; see joint_angles."""
+    return float(joint_angles(points, np.array([(a, b, c)]))[0])
+
+
+def wrist_angle(points):
+    """Wrist orientation in degrees: direction from the wrist to the middle-finger MCP."""
+    dx, dy = points[MIDDLE_MCP, :2] - points[WRIST, :2]
+    return float(np.degrees(np.arctan2(dy, dx)))
+
+
+def pairwise_distances(points, indices=None, dims=2):
+    """Distance matrix between ``points[indices]`` using the first ``dims`` coordinates."""
+    selected = points[:, :dims] if indices is None else points[np.asarray(indices), :dims]
+    diff = selected[:, None, :] - selected[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1))
+
+
+def distances_from(points, origin, indices, dims=2):
+    """Distances from ``points[origin]`` to each of ``points[indices]``."""
+    return np.linalg.norm(points[np.asarray(indices), :dims] - points[origin, :dims], axis=1)
+
+
+def distance(points, i, j, dims=2):
+    return float(np.linalg.norm(points[i, :dims] - points[j, :dims]))
+
+
+def proximity_accuracy(points, i, j, span=0.25):
+    """100 when points i and j touch, falling linearly to 0 at ``span`` apart."""
+    normalized = min(distance(points, i, j) / span, 1.0)
+    return round((1 - normalized) * 100, 2)
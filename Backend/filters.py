@@ -0,0 +1,135 @@
+import math
+
+import numpy as np
+
+# =====================================================
+# 🪶 Landmark Filtering and Inference Stride
+# =====================================================
+# A One-Euro filter over whole landmark arrays smooths jitter without
+# lagging fast movements. Its velocity estimate also lets us skip
+# inference on most frames: on skipped frames the landmarks are
+# extrapolated from the last filtered position and velocity, and the
+# exercise counters consume that filtered stream either way.
+#
+# MediaPipe does not keep the order of several hands between frames, so
+# each group is matched to the filter nearest its centroid rather than by
+# list position. Only x, y and z are filtered; a visibility column is
+# passed through as the model reported it.
+
+MAX_MATCH_DISTANCE = 0.2    # normalized centroid jump beyond which a group starts a new filter
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """Vectorized One-Euro filter (Casiez et al.) over an array of coordinates.
+
+    Coordinates are MediaPipe-normalized (0-1), so ``beta`` is much larger
+    than the pixel-space values usually quoted.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=5.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.x_prev = None
+        self.dx_prev = None
+        self.t_prev = None
+
+    def __call__(self, x, t):
+        if self.x_prev is None or x.shape != self.x_prev.shape:
+            self.x_prev = x.astype(np.float32)
+            self.dx_prev = np.zeros_like(self.x_prev)
+            self.t_prev = t
+            return self.x_prev
+
+        dt = max(t - self.t_prev, 1e-6)
+        dx = (x - self.x_prev) / dt
+        a_d = _alpha(self.d_cutoff, dt)
+        dx_hat = a_d * dx + (1 - a_d) * self.dx_prev
+
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        tau = 1.0 / (2 * np.pi * cutoff)
+        a = 1.0 / (1.0 + tau / dt)
+        x_hat = a * x + (1 - a) * self.x_prev
+
+        self.x_prev, self.dx_prev, self.t_prev = x_hat, dx_hat, t
+        return x_hat
+
+    def predict(self, t):
+        """Extrapolate the last filtered position to time ``t`` (state unchanged)."""
+        return self.x_prev + self.dx_prev * (t - self.t_prev)
+
+    def speed(self):
+        """Mean x/y speed of the landmarks in normalized units per second."""
+        return float(np.abs(self.dx_prev[:, :2]).mean()) if self.dx_prev is not None else 0.0
+
+
+class LandmarkSmoother:
+    """Decides which frames get inference and fills the rest by prediction.
+
+    ``stride`` runs the model every k-th frame; with ``adaptive`` it runs on
+    every frame while the landmarks move faster than ``motion_threshold``.
+    """
+
+    def __init__(self, stride=1, adaptive=False, smooth=True, motion_threshold=0.5,
+                 min_cutoff=1.0, beta=5.0):
+        self.stride = max(1, int(stride))
+        self.adaptive = adaptive
+        self.smooth = smooth or self.stride > 1
+        self.motion_threshold = motion_threshold
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.filters = []
+        self.extras = []        # per filter: columns past x, y, z (visibility) from its last update
+        self.skipped = 0
+
+    def reset(self):
+        self.filters = []
+        self.extras = []
+        self.skipped = 0
+
+    def should_infer(self):
+        if self.stride <= 1 or not self.filters:
+            return True
+        if self.adaptive and max(f.speed() for f in self.filters) > self.motion_threshold:
+            return True
+        return self.skipped >= self.stride - 1
+
+    def update(self, arrays, t):
+        """Filter fresh model output, each group by the filter that tracked it so far."""
+        self.skipped = 0
+        if not self.smooth:
+            return arrays
+        self.filters = self._match(arrays)
+        self.extras = [a[:, 3:] for a in arrays]
+        return [self._join(f(a[:, :3], t), extra) for f, a, extra in zip(self.filters, arrays, self.extras)]
+
+    def predict(self, t):
+        """Landmarks for a frame without inference."""
+        self.skipped += 1
+        return [self._join(f.predict(t), extra) for f, extra in zip(self.filters, self.extras)]
+
+    @staticmethod
+    def _join(xyz, extra):
+        return np.hstack([xyz, extra]) if extra.shape[1] else xyz
+
+    def _match(self, arrays):
+        """Filters in the order of ``arrays``: greedily the nearest by centroid, new ones for the rest."""
+        centroids = [a[:, :2].mean(axis=0) for a in arrays]
+        candidates = sorted(
+            (float(np.linalg.norm(c - f.x_prev[:, :2].mean(axis=0))), i, j)
+            for i, c in enumerate(centroids) for j, f in enumerate(self.filters)
+            if f.x_prev.shape == arrays[i][:, :3].shape
+        )
+        matched, taken = {}, set()
+        for distance, i, j in candidates:
+            if distance > MAX_MATCH_DISTANCE:
+                break
+            if i not in matched and j not in taken:
+                matched[i] = self.filters[j]
+                taken.add(j)
+        return [matched.get(i) or OneEuroFilter(self.min_cutoff, self.beta) for i in range(len(arrays))]
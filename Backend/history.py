@@ -0,0 +1,312 @@
+import json
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+
+from landmarks import SCALE, pack_arrays
+
+# =====================================================
+# 🗄️ Session History (SQLite)
+# =====================================================
+# Exercise sessions, per-rep events and a downsampled landmark / angle
+# time series are written to a local SQLite file. Pipelines only put rows
+# on a queue; one writer thread commits them in batches, so capture and
+# inference never wait on disk. Reads use their own connection (WAL mode
+# lets them run alongside the writer).
+#
+# MOTIONAID_HISTORY sets the database path; an empty value disables it.
+
+DB_PATH = os.environ.get("MOTIONAID_HISTORY", os.path.join(os.path.dirname(os.path.abspath(__file__)), "history.db"))
+ENABLED = bool(DB_PATH)
+
+SAMPLE_HZ = 5.0         # time series rate per session
+BATCH_SIZE = 500        # rows per transaction at most
+FLUSH_SECONDS = 1.0     # commit at least this often while rows are waiting
+MAX_PENDING = 20000     # rows queued before new ones are dropped
+MAX_LIMIT = 1000        # sessions one query returns at most
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    patient TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL,
+    count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS reps (
+    session_id TEXT NOT NULL,
+    patient TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    t REAL NOT NULL,
+    rep INTEGER NOT NULL,
+    accuracy REAL,
+    angle REAL,
+    detail TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    session_id TEXT NOT NULL,
+    t REAL NOT NULL,
+    angle REAL,
+    accuracy REAL,
+    groups INTEGER NOT NULL,
+    landmarks BLOB
+);
+CREATE INDEX IF NOT EXISTS sessions_patient_exercise ON sessions (patient, exercise, started);
+CREATE INDEX IF NOT EXISTS reps_patient_exercise ON reps (patient, exercise, t);
+CREATE INDEX IF NOT EXISTS reps_session ON reps (session_id, t);
+CREATE INDEX IF NOT EXISTS samples_session ON samples (session_id, t);
+"""
+
+INSERT = {
+    "session": "INSERT INTO sessions (id, patient, exercise, started) VALUES (?, ?, ?, ?)",
+    "end": "UPDATE sessions SET ended = ?, count = ? WHERE id = ?",
+    "rep": "INSERT INTO reps VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "sample": "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?)",
+}
+
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class HistoryStore:
+    """Queue-fed SQLite writer plus the read queries."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self.pending = queue.Queue(MAX_PENDING)
+        self.dropped = 0
+        with connect(path) as conn:
+            conn.executescript(SCHEMA)
+        self.reader = connect(path)
+        self.read_lock = threading.Lock()
+        self.thread = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self.thread.start()
+
+    # ---------- writes (never block the caller) ----------
+    def _put(self, kind, row):
+        try:
+            self.pending.put_nowait((kind, row))
+        except queue.Full:
+            self.dropped += 1
+
+    def start_session(self, patient, exercise):
+        session_id = uuid.uuid4().hex
+        self._put("session", (session_id, patient, exercise, time.time()))
+        return session_id
+
+    def end_session(self, session_id, count):
+        self._put("end", (time.time(), count, session_id))
+
+    def add_rep(self, session_id, patient, exercise, rep, payload):
+        detail = {k: v for k, v in payload.items() if k not in ("count", "accuracy", "angle", "taps")}
+        self._put("rep", (session_id, patient, exercise, time.time(), rep,
+                          payload.get("accuracy"), payload.get("angle"), json.dumps(detail)))
+
+    def add_sample(self, session_id, payload, arrays):
+        self._put("sample", (session_id, time.time(), payload.get("angle"), payload.get("accuracy"),
+                             len(arrays), pack_arrays([a[:, :3] for a in arrays])))
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        while True:
+            batch = [self.pending.get()]
+            deadline = time.monotonic() + FLUSH_SECONDS
+            while len(batch) < BATCH_SIZE and batch[-1] is not None:
+                try:
+                    batch.append(self.pending.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            closing = batch[-1] is None
+            rows = {}
+            for item in batch[:-1] if closing else batch:
+                rows.setdefault(item[0], []).append(item[1])
+            try:
+                with conn:
+                    # Sessions first so ended/rep rows always find theirs
+                    for kind in INSERT:
+                        if kind in rows:
+                            conn.executemany(INSERT[kind], rows[kind])
+            except sqlite3.Error as e:
+                print(f"⚠️ History write failed: {e}")
+            if closing:
+                conn.close()
+                return
+
+    def close(self, timeout=5.0):
+        """Flush what is queued and stop the writer."""
+        self.pending.put(None)
+        self.thread.join(timeout)
+        self.reader.close()
+
+    # ---------- reads ----------
+    def _query(self, sql, params):
+        with self.read_lock:
+            cursor = self.reader.execute(sql, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def progress(self, patient, exercise=None, since=None, until=None):
+        """Per-day totals for ``patient`` (optionally one exercise, between epoch times)."""
+        where, params = self._filter(patient, exercise, since, until, "started")
+        days = self._query(
+            f"""SELECT date(started, 'unixepoch', 'localtime') AS day, exercise,
+                       COUNT(*) AS sessions, SUM(count) AS reps,
+                       SUM(COALESCE(ended, started) - started) AS seconds
+                FROM sessions WHERE {where}
+                GROUP BY day, exercise ORDER BY day, exercise""", params)
+        where, params = self._filter(patient, exercise, since, until, "t")
+        quality = self._query(
+            f"""SELECT date(t, 'unixepoch', 'localtime') AS day, exercise,
+                       AVG(accuracy) AS accuracy, MIN(angle) AS angle_min, MAX(angle) AS angle_max
+                FROM reps WHERE {where}
+                GROUP BY day, exercise""", params)
+        by_day = {(row["day"], row["exercise"]): row for row in quality}
+        for row in days:
+            extra = by_day.get((row["day"], row["exercise"]), {})
+            row.update({key: extra.get(key) for key in ("accuracy", "angle_min", "angle_max")})
+        return days
+
+    def sessions(self, patient, exercise=None, since=None, until=None, limit=100):
+        where, params = self._filter(patient, exercise, since, until, "started")
+        return self._query(f"SELECT * FROM sessions WHERE {where} ORDER BY started DESC LIMIT ?",
+                           params + [limit])
+
+    def reps(self, session_id):
+        rows = self._query("SELECT t, rep, accuracy, angle, detail FROM reps WHERE session_id = ? ORDER BY t",
+                           [session_id])
+        for row in rows:
+            row["detail"] = json.loads(row["detail"]) if row["detail"] else {}
+        return rows
+
+    def samples(self, session_id, with_landmarks=False):
+        """Time series of one session; landmarks are int16 (x, y, z) rows scaled by ``scale``."""
+        columns = "t, angle, accuracy, groups" + (", landmarks" if with_landmarks else "")
+        rows = self._query(f"SELECT {columns} FROM samples WHERE session_id = ? ORDER BY t", [session_id])
+        if with_landmarks:
+            for row in rows:
+                row["scale"] = SCALE
+        return rows
+
+    @staticmethod
+    def _filter(patient, exercise, since, until, column):
+        clauses, params = ["patient = ?"], [patient]
+        if exercise:
+            clauses.append("exercise = ?")
+            params.append(exercise)
+        if since is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(float(since))
+        if until is not None:
+            clauses.append(f"{column} < ?")
+            params.append(float(until))
+        return " AND ".join(clauses), params
+
+
+class QueryError(ValueError):
+    """A malformed history query parameter."""
+
+
+def _epoch(request, key):
+    value = request.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        value = math.nan
+    if not math.isfinite(value):
+        raise QueryError(f"'{key}' must be an epoch time in seconds")
+    return value
+
+
+def _limit(request):
+    try:
+        limit = int(request.get("limit", 100))
+    except (TypeError, ValueError):
+        raise QueryError("'limit' must be an integer") from None
+    return min(max(limit, 1), MAX_LIMIT)
+
+
+def answer(store, request, landmarks=False):
+    """Reply to a history query (socket event or HTTP parameters).
+
+    With ``session_id`` it returns that session's reps and samples;
+    otherwise per-day progress and recent sessions for ``patient``,
+    optionally narrowed by ``exercise`` and epoch ``since``/``until``.
+    ``limit`` is clamped to 1..MAX_LIMIT. A malformed parameter gives a
+    reply with an ``error`` message instead.
+    """
+    if store is None:
+        return {"enabled": False}
+    if request.get("session_id"):
+        session_id = str(request["session_id"])
+        return {"enabled": True, "session_id": session_id, "reps": store.reps(session_id),
+                "samples": store.samples(session_id, with_landmarks=landmarks)}
+    try:
+        exercise = str(request["exercise"]) if request.get("exercise") else None
+        window = (exercise, _epoch(request, "since"), _epoch(request, "until"))
+        limit = _limit(request)
+    except QueryError as e:
+        return {"enabled": True, "error": str(e)}
+    patient = str(request.get("patient", "anonymous"))
+    return {"enabled": True, "patient": patient, "progress": store.progress(patient, *window),
+            "sessions": store.sessions(patient, *window, limit=limit)}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide store, opened on first use; None when history is disabled."""
+    global _store
+    if not ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore(DB_PATH)
+        return _store
+
+
+def history_stage(store, patient):
+    """Pipeline stage recording sessions, reps and samples; returns ``(fn, close)``.
+
+    A new history session starts whenever the exercise plugin changes; a
+    rep is recorded each time the payload's count goes up.
+    """
+    state = {"exercise": None, "id": None, "count": 0, "next_sample": 0.0}
+
+    def close():
+        if state["id"] is not None:
+            store.end_session(state["id"], state["count"])
+            state["id"] = None
+
+    def record(packet):
+        exercise = packet["exercise"]
+        if exercise is not state["exercise"]:
+            close()
+            state.update(exercise=exercise, id=store.start_session(patient, exercise.name),
+                         count=0, next_sample=0.0)
+
+        payload = packet["payload"]
+        count = payload.get("count", 0)
+        if count > state["count"]:
+            store.add_rep(state["id"], patient, exercise.name, count, payload)
+        state["count"] = count
+
+        if packet["timestamp"] >= state["next_sample"]:
+            store.add_sample(state["id"], payload, packet["arrays"])
+            state["next_sample"] = packet["timestamp"] + 1.0 / SAMPLE_HZ
+        return packet
+
+    return record, close
@@ -0,0 +1,216 @@
+import itertools
+import multiprocessing as mp_proc
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# =====================================================
+# 🏭 Process-Pool Inference
+# =====================================================
+# N worker processes each own their MediaPipe graphs. A frame is copied
+# once into the worker's shared-memory block (no pickling of pixels) and
+# only the landmark arrays come back over the result queue. Calls to one
+# worker are serialized by a lock, which matches how a single-threaded
+# worker process runs anyway.
+#
+# A call that times out skips its frame instead of failing. The worker may
+# still be reading that frame, so its block is not overwritten (and later
+# frames are skipped too) until the late answer has arrived.
+
+MAX_FRAME_BYTES = int(os.environ.get("MOTIONAID_MAX_FRAME_BYTES", str(1920 * 1080 * 3)))
+WORKERS = int(os.environ.get("MOTIONAID_INFERENCE_WORKERS", str(os.cpu_count() or 1)))
+
+
+def extract_arrays(kind, results):
+    """Landmark groups from a MediaPipe result as (N, 4) float32 arrays."""
+    from landmarks import landmarks_to_array
+    from models import landmark_groups
+
+    return [landmarks_to_array(group) for group in landmark_groups(kind, results)]
+
+
+def _worker_main(shm_name, requests, responses):
+    from models import MODEL_FACTORIES
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    graphs = {}
+    try:
+        while True:
+            message = requests.get()
+            if message is None:
+                break
+
+            request_id, model_id, kind, shape = message
+            try:
+                if shape is None:
+                    graph = graphs.pop(model_id, None)
+                    if graph is not None:
+                        graph.close()
+                    responses.put((request_id, [], None))
+                    continue
+
+                graph = graphs.get(model_id)
+                if graph is None:
+                    graph = graphs[model_id] = MODEL_FACTORIES[kind]()
+                frame = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+                responses.put((request_id, extract_arrays(kind, graph.process(frame)), None))
+            except Exception as e:
+                responses.put((request_id, None, repr(e)))
+    finally:
+        for graph in graphs.values():
+            graph.close()
+        shm.close()
+
+
+class RemoteResults:
+    """Landmark arrays from a worker; MediaPipe's attribute names are built only on access."""
+
+    def __init__(self, kind, arrays):
+        self.kind = kind
+        self.arrays = arrays
+
+    def _lists(self, kind):
+        from landmarks import arrays_to_landmark_lists
+
+        if kind != self.kind or not self.arrays:
+            return None
+        return arrays_to_landmark_lists(self.arrays, with_visibility=(kind == "pose"))
+
+    @property
+    def multi_hand_landmarks(self):
+        return self._lists("hands")
+
+    @property
+    def pose_landmarks(self):
+        lists = self._lists("pose")
+        return lists[0] if lists else None
+
+    @property
+    def multi_face_landmarks(self):
+        return self._lists("face_mesh")
+
+
+class Worker:
+    """One inference process plus its shared-memory input block."""
+
+    def __init__(self, ctx, index):
+        self.shm = shared_memory.SharedMemory(create=True, size=MAX_FRAME_BYTES)
+        self.requests = ctx.Queue()
+        self.responses = ctx.Queue()
+        self.lock = threading.Lock()
+        self.request_ids = itertools.count(1)
+        self.late = None        # id of a timed-out frame the worker may still be reading
+        self.skipped = 0
+        self.process = ctx.Process(target=_worker_main, name=f"inference-{index}",
+                                   args=(self.shm.name, self.requests, self.responses), daemon=True)
+        self.process.start()
+
+    def call(self, model_id, kind, frame=None, timeout=10.0):
+        """Landmark arrays for ``frame`` (or close ``model_id`` when None).
+
+        Returns None when the frame was skipped: the worker did not answer
+        within ``timeout``, or has not yet answered an earlier frame that did.
+        """
+        with self.lock:
+            if frame is not None:
+                if frame.nbytes > self.shm.size:
+                    raise ValueError(f"Frame of {frame.nbytes} bytes exceeds MOTIONAID_MAX_FRAME_BYTES")
+                if self.late is not None and self._answer(self.late, 0) is None:
+                    self.skipped += 1
+                    return None
+                view = np.ndarray(frame.shape, dtype=np.uint8, buffer=self.shm.buf)
+                np.copyto(view, frame)
+                del view
+            request_id = next(self.request_ids)
+            self.requests.put((request_id, model_id, kind, frame.shape if frame is not None else None))
+            answer = self._answer(request_id, timeout)
+            if answer is None:
+                self.skipped += 1
+                if frame is not None:
+                    self.late = request_id
+                print(f"⚠️ {self.process.name} did not answer within {timeout:.1f}s, frame skipped")
+                return None
+        arrays, error = answer
+        if error is not None:
+            raise RuntimeError(f"Inference worker failed: {error}")
+        return arrays
+
+    def _answer(self, request_id, timeout):
+        """``(arrays, error)`` for ``request_id``, or None on timeout.
+
+        Late answers to earlier calls are skipped; once one at or past
+        ``self.late`` arrives the worker is done with the shared block.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                answered, arrays, error = self.responses.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                return None
+            if self.late is not None and answered >= self.late:
+                self.late = None
+            if answered == request_id:
+                return arrays, error
+
+    def close(self):
+        self.requests.put(None)
+        self.process.join(timeout=5.0)
+        self.shm.close()
+        self.shm.unlink()
+
+
+class RemoteModel:
+    """Drop-in for a MediaPipe graph whose ``process`` runs in a worker process.
+
+    Each RemoteModel is pinned to one worker so the graph keeps its
+    tracking state between frames.
+    """
+
+    def __init__(self, worker, kind, model_id):
+        self.worker = worker
+        self.kind = kind
+        self.model_id = model_id
+
+    def process(self, rgb):
+        """Results for ``rgb``, or None when the worker skipped the frame (see Worker.call)."""
+        arrays = self.worker.call(self.model_id, self.kind, rgb)
+        return RemoteResults(self.kind, arrays) if arrays is not None else None
+
+    def close(self):
+        self.worker.call(self.model_id, self.kind)
+
+
+class InferencePool:
+    """Fixed set of worker processes handing out pinned RemoteModels round-robin."""
+
+    def __init__(self, workers=WORKERS):
+        ctx = mp_proc.get_context("spawn")
+        self.workers = [Worker(ctx, i) for i in range(workers)]
+        self.next_worker = itertools.cycle(self.workers)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def model(self, kind):
+        with self.lock:
+            return RemoteModel(next(self.next_worker), kind, next(self.ids))
+
+    def close(self):
+        for worker in self.workers:
+            worker.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_inference_pool():
+    """Start the shared worker pool on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = InferencePool()
+        return _pool
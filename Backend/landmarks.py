@@ -0,0 +1,67 @@
+import numpy as np
+
+# =====================================================
+# 📍 Compact Landmark Packing
+# =====================================================
+# Landmarks-only streaming sends int16 (x, y, z, visibility) rows instead
+# of a rendered JPEG. Normalized coordinates are multiplied by SCALE, so a
+# hand (21 points) costs 168 bytes and a full pose (33 points) 264 bytes.
+
+SCALE = 10000
+INT16_MAX = np.iinfo(np.int16).max
+
+
+def landmarks_to_array(landmark_list):
+    """Convert a MediaPipe NormalizedLandmarkList to an (N, 4) float32 array."""
+    points = landmark_list.landmark
+    array = np.empty((len(points), 4), dtype=np.float32)
+    for i, lm in enumerate(points):
+        array[i] = (lm.x, lm.y, lm.z, lm.visibility)
+    return array
+
+
+def arrays_to_landmark_lists(arrays, with_visibility=None):
+    """Rebuild MediaPipe NormalizedLandmarkLists (for drawing) from (N, 3+) arrays.
+
+    Visibility is copied from the fourth column; by default whenever an
+    array has one.
+    """
+    from mediapipe.framework.formats import landmark_pb2
+
+    lists = []
+    for array in arrays:
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        visibility = array.shape[1] > 3 if with_visibility is None else with_visibility
+        for row in array.tolist():
+            if visibility:
+                landmark_list.landmark.add(x=row[0], y=row[1], z=row[2], visibility=row[3])
+            else:
+                landmark_list.landmark.add(x=row[0], y=row[1], z=row[2])
+        lists.append(landmark_list)
+    return lists
+
+
+def pack_arrays(arrays):
+    """Quantize one or more (N, k) landmark arrays into little-endian int16 bytes."""
+    if not len(arrays):
+        return b""
+    quantized = np.clip(np.rint(np.concatenate(arrays) * SCALE), -INT16_MAX, INT16_MAX)
+    return quantized.astype("<i2").tobytes()
+
+
+def with_visibility_column(array):
+    """``array`` as (N, 4); arrays without visibility get 0, as MediaPipe reports for hands."""
+    if array.shape[1] >= 4:
+        return array[:, :4]
+    return np.hstack([array[:, :3], np.zeros((len(array), 1), dtype=array.dtype)])
+
+
+def landmark_payload(arrays, model):
+    """Socket payload fields describing the packed (x, y, z, visibility) landmark arrays."""
+    arrays = arrays or []
+    return {
+        "model": model,
+        "landmarks": pack_arrays([with_visibility_column(a) for a in arrays]),
+        "groups": len(arrays),
+        "scale": SCALE,
+    }
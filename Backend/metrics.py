@@ -0,0 +1,199 @@
+import bisect
+import os
+import threading
+import time
+
+# =====================================================
+# 📈 Live Metrics (Prometheus text format)
+# =====================================================
+# Per-stage timing histograms, frame age at emit and drop counters are
+# recorded by the pipelines; session and model pool gauges are read when
+# scraped. Set MOTIONAID_METRICS=1 to turn it on. When it is off no
+# pipeline gets a metrics object, so the hot loop does nothing extra.
+
+ENABLED = os.environ.get("MOTIONAID_METRICS", "0") == "1"
+
+# Seconds; stage costs are a few ms, frame ages tens to hundreds of ms
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+AGE_BUCKETS = (0.01, 0.025, 0.05, 0.075, 0.1, 0.15, 0.2, 0.3, 0.5, 1.0, 2.0)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def samples(self, name, labels):
+        return [f"{name}{_labels(labels)} {self.value}"]
+
+    def snapshot(self):
+        return {"value": self.value}
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect and three additions."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self):
+        with self.lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        running = 0
+        bounds = []
+        for bound, n in zip(self.buckets + ("+Inf",), counts):
+            running += n
+            bounds.append((bound, running))
+        return bounds, total, count
+
+    def samples(self, name, labels):
+        bounds, total, count = self.cumulative()
+        lines = [f"{name}_bucket{_labels(labels + (('le', bound),))} {n}" for bound, n in bounds]
+        lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+        lines.append(f"{name}_count{_labels(labels)} {count}")
+        return lines
+
+    def snapshot(self):
+        bounds, total, count = self.cumulative()
+        return {"buckets": {str(bound): n for bound, n in bounds}, "sum": round(total, 6), "count": count}
+
+
+class Registry:
+    """Named metric families; each family holds one metric per label set."""
+
+    def __init__(self):
+        self.families = {}      # name -> (type, help, {labels: metric})
+        self.gauges = {}        # name -> (help, fn returning {labels: value})
+        self.lock = threading.Lock()
+
+    def _metric(self, kind, name, help, labels, factory):
+        labels = tuple(sorted(labels.items()))
+        with self.lock:
+            family = self.families.setdefault(name, (kind, help, {}))
+            metric = family[2].get(labels)
+            if metric is None:
+                metric = family[2][labels] = factory()
+            return metric
+
+    def counter(self, name, help, **labels):
+        return self._metric("counter", name, help, labels, Counter)
+
+    def histogram(self, name, help, buckets, **labels):
+        return self._metric("histogram", name, help, labels, lambda: Histogram(buckets))
+
+    def gauge(self, name, help, fn):
+        """Register ``fn()`` (a number, or ``{labels dict as tuple: value}``) read at scrape time."""
+        with self.lock:
+            self.gauges[name] = (help, fn)
+
+    def _gauge_values(self, fn):
+        value = fn()
+        return value.items() if isinstance(value, dict) else [((), value)]
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self.lock:
+            families = {name: (kind, help, dict(metrics)) for name, (kind, help, metrics) in self.families.items()}
+            gauges = dict(self.gauges)
+        for name, (kind, help, metrics) in families.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            for labels, metric in metrics.items():
+                lines += metric.samples(name, labels)
+        for name, (help, fn) in gauges.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{_labels(labels)} {value}" for labels, value in self._gauge_values(fn)]
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """The same metrics as a JSON-friendly dict (for the dashboard socket event)."""
+        with self.lock:
+            families = {name: dict(metrics) for name, (_, _, metrics) in self.families.items()}
+            gauges = dict(self.gauges)
+        snapshot = {name: [{"labels": dict(labels), **metric.snapshot()} for labels, metric in metrics.items()]
+                    for name, metrics in families.items()}
+        for name, (_, fn) in gauges.items():
+            snapshot[name] = [{"labels": dict(labels), "value": value} for labels, value in self._gauge_values(fn)]
+        return snapshot
+
+
+registry = Registry()
+
+
+class PipelineMetrics:
+    """What a Pipeline records per frame when metrics are enabled."""
+
+    def __init__(self, registry=registry):
+        self.registry = registry
+        self.stage_seconds = {}
+        self.frame_age = registry.histogram(
+            "motionaid_frame_age_seconds", "Time from camera capture to emit", AGE_BUCKETS)
+        self.skipped = registry.counter(
+            "motionaid_frames_dropped_total", "Frames dropped before or between stages", stage="camera")
+
+    def stage(self, name):
+        histogram = self.stage_seconds.get(name)
+        if histogram is None:
+            histogram = self.stage_seconds[name] = self.registry.histogram(
+                "motionaid_stage_seconds", "Time spent in each pipeline stage per frame", STAGE_BUCKETS, stage=name)
+        return histogram
+
+    def dropped(self, name):
+        """Counter for packets dropped from the inbox of stage ``name``."""
+        return self.registry.counter(
+            "motionaid_frames_dropped_total", "Frames dropped before or between stages", stage=name)
+
+    def observe(self, stage, packet, seconds):
+        self.stage(stage.name).observe(seconds)
+        if stage.inbox is None and packet.get("skipped"):
+            self.skipped.inc(packet["skipped"])
+        if stage.outbox is None and "timestamp" in packet:
+            self.frame_age.observe(time.monotonic() - packet["timestamp"])
+
+
+pipeline_metrics = PipelineMetrics() if ENABLED else None
+
+
+def register_server_gauges(sessions, pool, supervisor, registry=registry):
+    """Session counts, model pool usage and worker threads, read at scrape time."""
+
+    def pool_gauge(field):
+        def read():
+            stats = pool.stats()
+            if field == "utilization":
+                return {(("kind", kind),): round((s["created"] - s["idle"]) / s["size"], 3) for kind, s in stats.items()}
+            return {(("kind", kind),): s[field] for kind, s in stats.items()}
+        return read
+
+    registry.gauge("motionaid_sessions", "Connected client sessions", lambda: len(sessions))
+    registry.gauge("motionaid_active_sessions", "Sessions with a running pipeline", sessions.active)
+    registry.gauge("motionaid_model_pool_created", "Graphs built per model kind", pool_gauge("created"))
+    registry.gauge("motionaid_model_pool_idle", "Idle graphs per model kind", pool_gauge("idle"))
+    registry.gauge("motionaid_model_pool_utilization", "Borrowed graphs / pool size", pool_gauge("utilization"))
+    registry.gauge("motionaid_workers", "Supervised exercise worker threads alive",
+                   lambda: supervisor.stats()["workers"])
+    registry.gauge("motionaid_workers_overdue_total", "Workers still running after their stop deadline",
+                   lambda: supervisor.stats()["overdue"])
+    registry.gauge("motionaid_workers_crashed_total", "Workers that exited with an exception",
+                   lambda: supervisor.stats()["crashed"])
@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+
+import numpy as np
+
+# =====================================================
+# 🧠 MediaPipe Model Pool
+# =====================================================
+# MediaPipe graphs keep tracking state and serialize calls, so every
+# session borrows its own instance. The pool caps how many graphs of each
+# kind exist at once; they are built lazily and reused after release.
+# mediapipe itself is only imported when the first graph is built.
+
+
+def solutions():
+    """``mediapipe.solutions``, imported on first use (it takes seconds)."""
+    import mediapipe as mp
+    return mp.solutions
+
+
+MODEL_FACTORIES = {
+    "hands": lambda: solutions().hands.Hands(min_detection_confidence=0.5, min_tracking_confidence=0.5),
+    "pose": lambda: solutions().pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5),
+    "face_mesh": lambda: solutions().face_mesh.FaceMesh(max_num_faces=1, refine_landmarks=True,
+                                                        min_detection_confidence=0.5, min_tracking_confidence=0.5),
+    # Pose, both hands and the face in one graph (see scheduler.py)
+    "holistic": lambda: solutions().holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5),
+}
+
+
+def connections(kind):
+    """Connections used when drawing a model's landmarks."""
+    if kind == "hands":
+        return solutions().hands.HAND_CONNECTIONS
+    if kind == "pose":
+        return solutions().pose.POSE_CONNECTIONS
+    return solutions().face_mesh.FACEMESH_CONTOURS
+
+
+def landmark_groups(kind, results):
+    """The list of landmark lists a model of ``kind`` found in ``results``."""
+    if kind == "hands":
+        return list(results.multi_hand_landmarks or [])
+    if kind == "pose":
+        return [results.pose_landmarks] if results.pose_landmarks else []
+    return list(results.multi_face_landmarks or [])
+
+
+def holistic_groups(results):
+    """Holistic results split into ``{kind: landmark lists}`` like the single models'."""
+    hands = [h for h in (results.left_hand_landmarks, results.right_hand_landmarks) if h]
+    return {
+        "pose": [results.pose_landmarks] if results.pose_landmarks else [],
+        "hands": hands,
+        "face_mesh": [results.face_landmarks] if results.face_landmarks else [],
+    }
+
+
+POOL_SIZE = int(os.environ.get("MOTIONAID_MODEL_POOL", "4"))
+
+# "local" runs graphs in this process; "process" runs them in the
+# inference.py worker pool and only moves landmark arrays back.
+INFERENCE_BACKEND = os.environ.get("MOTIONAID_INFERENCE", "local")
+
+# Model kinds built and run once on a dummy frame at server start
+PREWARM = [kind for kind in os.environ.get("MOTIONAID_PREWARM", "hands,pose").split(",") if kind]
+WARMUP_FRAME_SHAPE = (480, 640, 3)
+
+
+def remote_factories():
+    """Factories returning RemoteModel proxies pinned to pool workers (Holistic stays local-only)."""
+    from inference import get_inference_pool
+
+    return {kind: (lambda kind=kind: get_inference_pool().model(kind)) for kind in MODEL_FACTORIES
+            if kind != "holistic"}
+
+
+class ModelPool:
+    """Bounded, lazily filled pool of MediaPipe graphs per model kind."""
+
+    def __init__(self, size=POOL_SIZE, factories=None):
+        self.size = size
+        self.factories = factories or MODEL_FACTORIES
+        self.idle = {kind: [] for kind in self.factories}
+        self.created = {kind: 0 for kind in self.factories}
+        self.cond = threading.Condition()
+
+    def acquire(self, kind, timeout=5.0):
+        """Borrow a graph of ``kind``; raises RuntimeError if none frees up in time."""
+        with self.cond:
+            while not self.idle[kind] and self.created[kind] >= self.size:
+                if not self.cond.wait(timeout):
+                    raise RuntimeError(f"No free '{kind}' model (pool size {self.size})")
+            if self.idle[kind]:
+                return self.idle[kind].pop()
+            self.created[kind] += 1
+
+        try:
+            return self.factories[kind]()
+        except Exception:
+            with self.cond:
+                self.created[kind] -= 1
+                self.cond.notify()
+            raise
+
+    def release(self, kind, model):
+        with self.cond:
+            self.idle[kind].append(model)
+            self.cond.notify()
+
+    def prewarm(self, kind):
+        """Build one graph of ``kind`` and push a dummy frame through it.
+
+        The graph goes back to the idle list, so the first session that
+        needs it skips graph initialization. Returns the seconds spent.
+        """
+        started = time.perf_counter()
+        model = self.acquire(kind)
+        try:
+            model.process(np.zeros(WARMUP_FRAME_SHAPE, dtype=np.uint8))
+        finally:
+            self.release(kind, model)
+        return time.perf_counter() - started
+
+    def prewarm_in_background(self, kinds=None, on_done=None):
+        """Pre-warm ``kinds`` on a daemon thread; ``on_done(kind, seconds)`` after each."""
+
+        def run():
+            for kind in kinds if kinds is not None else PREWARM:
+                try:
+                    seconds = self.prewarm(kind)
+                except Exception as e:
+                    print(f"⚠️ Pre-warm of '{kind}' failed: {e}")
+                    continue
+                if on_done is not None:
+                    on_done(kind, seconds)
+
+        thread = threading.Thread(target=run, name="model-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self):
+        with self.cond:
+            return {
+                kind: {"created": self.created[kind], "idle": len(self.idle[kind]), "size": self.size}
+                for kind in self.factories
+            }
+
+
+model_pool = ModelPool(factories=remote_factories() if INFERENCE_BACKEND == "process" else None)
@@ -0,0 +1,61 @@
+import os
+
+import cv2
+import numpy as np
+
+# =====================================================
+# 💤 Motion Gate
+# =====================================================
+# While the patient rests the camera image barely changes, yet every
+# frame used to go through MediaPipe, drawing and JPEG encoding. The gate
+# compares a tiny grayscale copy of each frame with the last frame that
+# showed motion. Static frames are dropped before any other work; one
+# passes every ``keepalive`` seconds so the client keeps getting updates,
+# and the later stages reuse the previous landmarks and JPEG for it.
+
+# Gate sessions unless the start event says otherwise
+GATE_BY_DEFAULT = os.environ.get("MOTIONAID_MOTION_GATE", "0") == "1"
+
+
+class MotionGate:
+    """Frame-difference test on a downsampled grayscale frame."""
+
+    def __init__(self, pixel_threshold=15, changed_fraction=0.002, keepalive=1.0, size=(80, 60)):
+        self.pixel_threshold = pixel_threshold      # gray-level change that counts for a pixel
+        self.changed_fraction = changed_fraction    # share of changed pixels that counts as motion
+        self.keepalive = keepalive                  # seconds between frames let through while static
+        self.size = size
+        self.reset()
+
+    def reset(self):
+        self.reference = None
+        self.static = False
+        self.last_pass = None
+        width, height = self.size
+        self.small = np.empty((height, width, 3), np.uint8)
+        self.gray = np.empty((height, width), np.uint8)     # swapped with reference on motion
+        self.diff = np.empty((height, width), np.uint8)
+
+    def check(self, image, timestamp):
+        """True if this frame should be processed; sets ``static`` for it."""
+        cv2.resize(image, self.size, dst=self.small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY, dst=self.gray)
+        if self.reference is None or self._moved(self.gray):
+            if self.reference is None:
+                self.reference = np.empty_like(self.gray)
+            self.reference, self.gray = self.gray, self.reference
+            self.static = False
+            self.last_pass = timestamp
+            return True
+
+        self.static = True
+        if timestamp - self.last_pass >= self.keepalive:
+            self.last_pass = timestamp
+            return True
+        return False
+
+    def _moved(self, small):
+        cv2.absdiff(small, self.reference, dst=self.diff)
+        cv2.threshold(self.diff, self.pixel_threshold, 255, cv2.THRESH_BINARY, dst=self.diff)
+        changed = cv2.countNonZero(self.diff)
+        return changed > self.changed_fraction * small.size
@@ -0,0 +1,72 @@
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from models import connections
+
+# =====================================================
+# 🖌️ Batched Landmark Overlay
+# =====================================================
+# mp_drawing.draw_landmarks issues one cv2.line / cv2.circle per
+# connection and point from Python, which for pose and face mesh is a
+# noticeable part of the frame. Here a model's connections are turned into
+# an index array once, and all segments of a frame are drawn with one
+# cv2.polylines call and all points with another, straight from the
+# (N, 3+) landmark arrays. Like draw_landmarks, points outside the frame
+# (or with visibility < 0.5, when arrays carry it) are left out together
+# with their segments.
+
+# Point and line colors (BGR), line thickness, point radius
+Style = namedtuple("Style", "color line_color thickness radius")
+
+DEFAULT_STYLE = Style((0, 0, 255), (224, 224, 224), 2, 2)     # draw_landmarks' defaults
+
+HAND_STATE_STYLES = {
+    "Fully Open": Style((0, 255, 0), (0, 255, 0), 2, 4),
+    "Half Closed": Style((0, 255, 255), (0, 255, 255), 2, 4),
+    "Fully Closed": Style((0, 0, 255), (0, 0, 255), 2, 4),
+}
+
+VISIBILITY_THRESHOLD = 0.5
+
+_segments = {}
+
+
+def segment_indices(kind):
+    """(M, 2) landmark index pairs of a model's connections, built once per kind."""
+    indices = _segments.get(kind)
+    if indices is None:
+        indices = _segments[kind] = np.array(sorted(connections(kind)), dtype=np.intp).reshape(-1, 2)
+    return indices
+
+
+def draw_overlay(image, kind, arrays, style=DEFAULT_STYLE):
+    """Draw every landmark group in ``arrays`` onto ``image`` in place."""
+    if not len(arrays):
+        return image
+    height, width = image.shape[:2]
+    segments = segment_indices(kind)
+    lines, points = [], []
+    for array in arrays:
+        xy = array[:, :2]
+        shown = ((xy >= 0) & (xy <= 1)).all(axis=1)
+        if array.shape[1] > 3:
+            shown &= array[:, 3] >= VISIBILITY_THRESHOLD
+        pixels = (xy * (width, height)).astype(np.int32)
+        np.minimum(pixels, (width - 1, height - 1), out=pixels)
+        lines.append(pixels[segments[shown[segments].all(axis=1)]])
+        points.append(pixels[shown])
+
+    # polylines takes a sequence of point arrays; a single 3-D array would
+    # be read as one long polyline, hence list()
+    lines = np.concatenate(lines)
+    if len(lines):
+        cv2.polylines(image, list(lines), False, style.line_color, style.thickness)
+    points = np.concatenate(points)
+    if len(points):
+        # A zero-length segment is a dot as wide as the line: a filled circle
+        # (a one-point polyline draws nothing)
+        cv2.polylines(image, list(np.repeat(points[:, None, :], 2, axis=1)), False, style.color,
+                      2 * style.radius + style.thickness)
+    return image
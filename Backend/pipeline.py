@@ -0,0 +1,297 @@
+import base64
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from buffers import FrameBuffers, resize_into
+from supervisor import supervisor
+
+# "base64" keeps the old JSON string payload, "binary" sends raw JPEG bytes.
+DEFAULT_TRANSPORT = os.environ.get("MOTIONAID_TRANSPORT", "base64")
+
+
+def wants_binary(data):
+    """Read the transport a client asked for in its start event."""
+    transport = (data or {}).get("transport", DEFAULT_TRANSPORT)
+    return transport == "binary"
+
+
+def wants_landmarks(data):
+    """True when the client draws the skeleton itself and only needs landmarks."""
+    return (data or {}).get("mode") == "landmarks"
+
+# =====================================================
+# 🧵 Staged Frame Pipeline
+# =====================================================
+# capture → inference → render → encode → emit, each on its own worker
+# with a small bounded queue between them. When a queue is full the
+# oldest packet is dropped, so a slow stage never builds a backlog and
+# the user always sees the freshest result.
+
+
+def discard(packet):
+    """Run the ``release`` callback of a packet dropped before the end of the pipeline."""
+    release = packet.get("release")
+    if release is not None:
+        release()
+
+
+class DropOldestQueue:
+    """Bounded FIFO that discards the oldest item instead of blocking."""
+
+    def __init__(self, maxsize=2):
+        self.items = deque()
+        self.maxsize = maxsize
+        self.cond = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+        self.on_drop = None
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) >= self.maxsize:
+                discard(self.items.popleft())
+                self.dropped += 1
+                if self.on_drop is not None:
+                    self.on_drop()
+            self.items.append(item)
+            self.cond.notify()
+
+    def get(self, timeout=0.5):
+        """Next item, or None on timeout / after close()."""
+        with self.cond:
+            if not self.items and not self.closed:
+                self.cond.wait(timeout)
+            return self.items.popleft() if self.items else None
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class Stage:
+    """One pipeline step: ``fn(packet)`` returns the packet to pass on, or None to drop it.
+
+    Dropped packets, here or by a full queue, go through discard().
+
+    ``buffers`` (a buffers.FrameBuffers) holds images the stage passes
+    downstream; the pipeline sizes its ring to cover every packet in flight.
+    """
+
+    def __init__(self, name, fn, close=None, buffers=None):
+        self.name = name
+        self.fn = fn
+        self.close = close
+        self.buffers = buffers
+        self.inbox = None
+        self.outbox = None
+        self.processed = 0
+        self.busy = 0.0
+        self.thread = None
+        self.metrics = None
+
+    def _run(self, running, on_error=None):
+        """Process packets until ``running`` is cleared.
+
+        An exception from ``fn`` is passed to ``on_error(stage, error)``
+        after clearing ``running`` (stopping every stage of the pipeline),
+        then re-raised for the supervisor to record as a crash.
+        """
+        while running.is_set():
+            if self.inbox is None:
+                packet = {}
+            else:
+                packet = self.inbox.get()
+                if packet is None:
+                    continue
+
+            started = time.perf_counter()
+            try:
+                result = self.fn(packet)
+            except Exception as e:
+                running.clear()
+                if on_error is not None:
+                    on_error(self, e)
+                raise
+            elapsed = time.perf_counter() - started
+            self.busy += elapsed
+            if result is None:
+                discard(packet)
+                continue
+            packet = result
+
+            if self.metrics is not None:
+                self.metrics.observe(self, packet, elapsed)
+            self.processed += 1
+            if self.outbox is not None:
+                self.outbox.put(packet)
+
+    def stats(self):
+        return {
+            "queue_depth": len(self.inbox) if self.inbox is not None else 0,
+            "dropped": self.inbox.dropped if self.inbox is not None else 0,
+            "processed": self.processed,
+            "avg_ms": round(self.busy / self.processed * 1000, 2) if self.processed else 0.0,
+        }
+
+
+class Pipeline:
+    """Chain of stages connected by drop-oldest queues.
+
+    The first stage is the source: it receives an empty dict and fills it
+    (or returns None when there is nothing new yet). ``metrics`` (a
+    metrics.PipelineMetrics) records stage timings and drops when given.
+    Stage threads are started through ``supervisor`` under ``owner``.
+    When a stage fails or its thread crashes the whole pipeline stops and
+    ``on_error(stage, error)`` is called once, from that stage's thread.
+    """
+
+    def __init__(self, stages, queue_size=2, metrics=None, owner="pipeline", supervisor=supervisor,
+                 on_error=None):
+        self.stages = stages
+        self.on_error = on_error
+        self.owner = owner
+        self.supervisor = supervisor
+        self.workers = []
+        self.running = threading.Event()
+        self.failed = None          # (stage, error) that stopped the pipeline
+        self.fail_lock = threading.Lock()
+        for upstream, downstream in zip(stages, stages[1:]):
+            queue = DropOldestQueue(queue_size)
+            upstream.outbox = queue
+            downstream.inbox = queue
+        # Each stage holds at most one packet and each queue queue_size
+        in_flight = len(stages) * (queue_size + 1)
+        for stage in stages:
+            if stage.buffers is not None:
+                stage.buffers.depth = in_flight + 1
+        if metrics is not None:
+            for stage in stages:
+                stage.metrics = metrics
+                if stage.inbox is not None:
+                    stage.inbox.on_drop = metrics.dropped(stage.name).inc
+
+    def start(self):
+        self.running.set()
+        for stage in self.stages:
+            worker = self.supervisor.spawn(self.owner, f"stage-{stage.name}", stage._run,
+                                           self.running, self._fail,
+                                           on_crash=lambda worker, error, stage=stage: self._fail(stage, error))
+            stage.thread = worker.thread
+            self.workers.append(worker)
+        return self
+
+    def _fail(self, stage, error):
+        """Stop every stage after the first failure and report it."""
+        with self.fail_lock:
+            if self.failed is not None:
+                return
+            self.failed = (stage, error)
+        self.running.clear()
+        if self.on_error is not None:
+            self.on_error(stage, error)
+
+    def stop(self, timeout=2.0):
+        """Stop and join every stage within ``timeout`` overall; returns stages still running."""
+        self.running.clear()
+        for stage in self.stages:
+            if stage.inbox is not None:
+                stage.inbox.close()
+        alive = self.supervisor.join(self.workers, timeout)
+        for stage in self.stages:
+            if stage.close is not None:
+                stage.close()
+        return alive
+
+    def is_running(self):
+        return self.running.is_set()
+
+    def wait(self):
+        """Block until stop() is called from elsewhere."""
+        while self.running.is_set():
+            time.sleep(0.1)
+
+    def stats(self):
+        """Per-stage queue depth, drop count, throughput and average cost."""
+        return {stage.name: stage.stats() for stage in self.stages}
+
+
+# =====================================================
+# 🔧 Common stages
+# =====================================================
+def capture_stage(camera, flip=True, gate=None, buffers=None):
+    """Source stage pulling the newest frame from a CameraProducer.
+
+    Sources that are already mirrored (recordings) are not flipped again.
+    With a motion ``gate`` (motion.MotionGate) static frames are dropped
+    here, before any copy, and the keep-alive ones are marked ``static``.
+    The flipped copy goes into ``buffers`` (buffers.FrameBuffers) when given.
+    """
+    flip = flip and not getattr(camera, "mirrored", False)
+    last = {"seq": 0}
+
+    def capture(packet):
+        frame = camera.read(last["seq"])
+        if frame is None:
+            return None
+        packet["skipped"] = max(frame.seq - last["seq"] - 1, 0) if last["seq"] else 0
+        last["seq"] = frame.seq
+        if gate is not None:
+            if not gate.check(frame.image, frame.timestamp):
+                return None
+            packet["static"] = gate.static
+
+        packet["seq"] = frame.seq
+        packet["timestamp"] = frame.timestamp
+        if buffers is None:
+            packet["image"] = cv2.flip(frame.image, 1) if flip else frame.image.copy()
+        else:
+            image = buffers.get(frame.image.shape, frame.image.dtype)
+            if flip:
+                cv2.flip(frame.image, 1, dst=image)
+            else:
+                np.copyto(image, frame.image)
+            packet["image"] = image
+        packet["size"] = packet["image"].shape[:2]
+        return packet
+
+    return capture
+
+
+def encode_stage(binary=False, control=None):
+    """JPEG-encode the rendered image into ``packet["encoded"]``.
+
+    In binary mode the raw JPEG bytes are kept and socket.io sends them as
+    a binary attachment; otherwise they are base64 text (compatibility mode).
+    The raw bytes are also left in ``packet["jpeg"]`` for other viewers.
+    Packets marked ``reused`` (static scene) resend the previous encoding.
+    ``control`` (a delivery.DeliveryControl) sets JPEG quality and output
+    scale per frame.
+    """
+    last = {}
+    scaled = FrameBuffers()
+
+    def encode(packet):
+        if packet.get("reused") and last:
+            packet.update(last)
+            return packet
+        image, params = packet["image"], []
+        if control is not None:
+            if control.scale != 1.0:
+                image = resize_into(image, control.scale, scaled)
+            params = [cv2.IMWRITE_JPEG_QUALITY, control.quality]
+        _, buffer = cv2.imencode(".jpg", image, params)
+        jpeg = buffer.tobytes()
+        last["jpeg"] = packet["jpeg"] = jpeg
+        last["encoded"] = packet["encoded"] = jpeg if binary else base64.b64encode(jpeg).decode()
+        return packet
+
+    return encode
@@ -0,0 +1,238 @@
+import json
+import os
+import re
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from camera import Frame
+
+# =====================================================
+# 📼 Session Recording and Replay
+# =====================================================
+# A recording is a directory holding
+#   video.avi       MJPG-compressed frames (already mirrored)
+#   landmarks.npz   per-frame capture timestamps, model kind and the
+#                   landmark arrays the model produced (padded to 4
+#                   columns; group_widths keeps each array's own width)
+#   meta.json       frame size and fps
+# ReplaySource stands in for a CameraProducer. Its cached landmarks let
+# the engine skip inference, and replay_landmarks() feeds counters
+# straight from the cache without decoding any video.
+# Clients name recordings; they live under RECORDINGS_DIR on the server.
+
+VIDEO_FILE = "video.avi"
+LANDMARKS_FILE = "landmarks.npz"
+META_FILE = "meta.json"
+POINT_COLUMNS = 4       # x, y, z, visibility
+
+RECORDINGS_DIR = os.environ.get("MOTIONAID_RECORDINGS",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings"))
+RECORDING_NAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def is_recording(path):
+    return isinstance(path, str) and os.path.isfile(os.path.join(path, LANDMARKS_FILE))
+
+
+def recording_path(name):
+    """Directory of the recording called ``name`` under RECORDINGS_DIR.
+
+    Raises RuntimeError unless ``name`` is letters, digits, '_' and '-' only.
+    """
+    if not isinstance(name, str) or not RECORDING_NAME.fullmatch(name):
+        raise RuntimeError(f"Invalid recording name {name!r}")
+    return os.path.join(RECORDINGS_DIR, name)
+
+
+class Recorder:
+    """Appends frames, timestamps and landmark arrays to a recording directory."""
+
+    def __init__(self, path, fps=30.0):
+        self.path = path
+        self.fps = fps
+        self.writer = None
+        self.size = None
+        self.timestamps = []
+        self.kinds = []
+        self.frame_groups = []
+        self.group_sizes = []
+        self.group_widths = []
+        self.points = []
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, image, timestamp, kind="", arrays=()):
+        if self.writer is None:
+            self.size = image.shape[:2]
+            fourcc = cv2.VideoWriter_fourcc(*"MJPG")
+            self.writer = cv2.VideoWriter(os.path.join(self.path, VIDEO_FILE), fourcc, self.fps,
+                                          (self.size[1], self.size[0]))
+        self.writer.write(image)
+
+        self.timestamps.append(timestamp)
+        self.kinds.append(kind)
+        self.frame_groups.append(len(arrays))
+        for array in arrays:
+            array = np.asarray(array, dtype=np.float32)
+            self.group_sizes.append(len(array))
+            self.group_widths.append(array.shape[1])
+            points = np.zeros((len(array), POINT_COLUMNS), dtype=np.float32)
+            points[:, :array.shape[1]] = array[:, :POINT_COLUMNS]
+            self.points.append(points)
+
+    def close(self):
+        if self.writer is None:
+            return
+        self.writer.release()
+        self.writer = None
+        np.savez_compressed(
+            os.path.join(self.path, LANDMARKS_FILE),
+            timestamps=np.array(self.timestamps, dtype=np.float64),
+            kinds=np.array(self.kinds),
+            frame_groups=np.array(self.frame_groups, dtype=np.int32),
+            group_sizes=np.array(self.group_sizes, dtype=np.int32),
+            group_widths=np.array(self.group_widths, dtype=np.int32),
+            points=np.concatenate(self.points) if self.points else np.empty((0, POINT_COLUMNS), np.float32),
+        )
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump({"height": self.size[0], "width": self.size[1], "fps": self.fps,
+                       "frames": len(self.timestamps)}, f)
+
+
+def load_landmarks(path):
+    """``(timestamps, kinds, groups_per_frame, meta)`` from a recording."""
+    data = np.load(os.path.join(path, LANDMARKS_FILE))
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+
+    groups = np.split(data["points"], np.cumsum(data["group_sizes"])[:-1]) if len(data["group_sizes"]) else []
+    if "group_widths" in data:      # older recordings kept x, y, z only
+        groups = [group[:, :width] for group, width in zip(groups, data["group_widths"])]
+    bounds = np.concatenate([[0], np.cumsum(data["frame_groups"])])
+    per_frame = [groups[bounds[i]:bounds[i + 1]] for i in range(len(data["frame_groups"]))]
+    return data["timestamps"], [str(k) for k in data["kinds"]], per_frame, meta
+
+
+def replay_landmarks(path):
+    """Yield a minimal packet per recorded frame: seq, timestamp, size, kind and arrays."""
+    timestamps, kinds, per_frame, meta = load_landmarks(path)
+    size = (meta["height"], meta["width"])
+    for i, (timestamp, kind, arrays) in enumerate(zip(timestamps, kinds, per_frame)):
+        yield {"seq": i + 1, "timestamp": float(timestamp), "size": size,
+               "kind": kind, "arrays": arrays}
+
+
+def replay_counters(exercise, path):
+    """Feed a recording's cached landmarks straight into ``exercise``; returns every payload.
+
+    No video is decoded and no model runs, so counter logic can be
+    exercised at thousands of frames per second.
+    """
+    return [exercise.update(packet["arrays"], packet)
+            for packet in replay_landmarks(path) if packet["kind"] == exercise.model]
+
+
+class ReplaySource:
+    """Plays a recording back through the CameraProducer interface.
+
+    ``realtime`` paces frames by their recorded timestamps (skipping frames
+    if the consumer falls behind, like a live camera); otherwise every
+    frame is returned as fast as it can be decoded.
+    """
+
+    mirrored = True      # recorded frames are already flipped
+    exclusive = True     # one replay per session; stopped with its pipeline
+
+    def __init__(self, path, realtime=True, loop=False, use_cache=True):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.use_cache = use_cache
+        self.cap = None
+        self.lock = threading.Lock()
+        self.frame = None
+        self.running = False
+        self.stopped = threading.Event()    # wakes readers idling at the end of the recording
+
+    def start(self):
+        with self.lock:
+            if self.running:
+                return self
+            self.timestamps, self.kinds, self.per_frame, self.meta = load_landmarks(self.path)
+            self._rewind()
+            self.running = True
+            self.stopped.clear()
+        return self
+
+    def _rewind(self):
+        if self.cap is not None:
+            self.cap.release()
+        self.cap = cv2.VideoCapture(os.path.join(self.path, VIDEO_FILE))
+        self.index = 0
+        self.started = time.monotonic()
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            self.stopped.set()
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+
+    def _next_index(self):
+        if not self.realtime:
+            return self.index
+        elapsed = time.monotonic() - self.started
+        index = self.index
+        while index + 1 < len(self.timestamps) and self.timestamps[index + 1] - self.timestamps[0] <= elapsed:
+            index += 1
+        return index
+
+    def read(self, after_seq=0, timeout=1.0):
+        """Next frame, or None after waiting ``timeout`` once the recording has ended or stopped."""
+        with self.lock:
+            ended = not self.running or (self.index >= len(self.timestamps) and not self.loop)
+            if not ended:
+                return self._read(timeout)
+        # Like a camera with no new frame: block instead of letting the capture stage spin
+        self.stopped.wait(timeout)
+        return None
+
+    def _read(self, timeout):
+        """Decode the frame due now (rewinding a looped recording); called with the lock held."""
+        if self.index >= len(self.timestamps):
+            self._rewind()
+
+        target = self._next_index()
+        if self.realtime:
+            wait = (self.timestamps[target] - self.timestamps[0]) - (time.monotonic() - self.started)
+            if wait > 0:
+                time.sleep(min(wait, timeout))
+        while self.index < target:
+            self.cap.grab()
+            self.index += 1
+
+        success, image = self.cap.read()
+        self.index += 1
+        if not success:
+            return None
+
+        offset = self.started if self.realtime else 0.0
+        self.frame = Frame(image, offset + self.timestamps[target] - self.timestamps[0], target + 1)
+        return self.frame
+
+    def latest(self):
+        return self.frame
+
+    def finished(self):
+        """True once every frame has been read (never when looping)."""
+        return not self.loop and self.running and self.index >= len(self.timestamps)
+
+    def cached_landmarks(self, seq, kind):
+        """Recorded landmark arrays for frame ``seq`` if they came from ``kind``, else None."""
+        index = seq - 1
+        if self.use_cache and 0 <= index < len(self.kinds) and self.kinds[index] == kind:
+            return self.per_frame[index]
+        return None
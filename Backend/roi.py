@@ -0,0 +1,85 @@
+import numpy as np
+
+from buffers import FrameBuffers, resize_into
+
+# =====================================================
+# 🔍 Inference Region (downscale + ROI crop)
+# =====================================================
+# Instead of passing the full camera frame to MediaPipe, run inference on
+# a downscaled copy and/or on a crop around the previous frame's
+# landmarks. Landmarks come back normalized to that smaller input and are
+# mapped back to full-frame coordinates before anything else sees them.
+# When the crop loses the hand/body the next frame falls back to the
+# whole image.
+
+
+class InferenceRegion:
+    """Chooses what part of each frame, at what scale, goes to the model."""
+
+    def __init__(self, scale=1.0, crop=False, margin=0.3, min_size=0.25):
+        self.scale = scale          # resize factor applied to the model input
+        self.crop = crop            # crop around the last landmarks
+        self.margin = margin        # padding around the landmark box, relative to its size
+        self.min_size = min_size    # smallest crop side, relative to the frame
+        self.box = None             # (x0, y0, x1, y1) normalized, None = full frame
+        self.buffers = FrameBuffers()
+
+    def reset(self):
+        self.box = None
+
+    def prepare(self, rgb):
+        """Return ``(model_input, box)`` for this frame."""
+        box = self.box if self.crop else None
+        if box is not None:
+            h, w = rgb.shape[:2]
+            x0, y0, x1, y1 = box
+            rgb = rgb[int(y0 * h):int(y1 * h), int(x0 * w):int(x1 * w)]
+        if self.scale != 1.0:
+            rgb = resize_into(rgb, self.scale, self.buffers)
+        elif box is not None:
+            crop = self.buffers.get(rgb.shape, rgb.dtype)
+            np.copyto(crop, rgb)    # MediaPipe needs a contiguous image
+            rgb = crop
+        return rgb, box
+
+    @staticmethod
+    def to_full_frame(arrays, box):
+        """Map (N, 3+) landmark arrays normalized to ``box`` back to full-frame coordinates."""
+        if box is None:
+            return arrays
+        x0, y0, x1, y1 = box
+        bw, bh = x1 - x0, y1 - y0
+        scale = np.array([bw, bh, bw], dtype=np.float32)
+        offset = np.array([x0, y0, 0.0], dtype=np.float32)
+        mapped = []
+        for array in arrays:
+            array = array.copy()
+            array[:, :3] = array[:, :3] * scale + offset
+            mapped.append(array)
+        return mapped
+
+    def update(self, arrays):
+        """Pick next frame's crop from this frame's full-frame landmark arrays."""
+        if not self.crop:
+            return
+        if not arrays:
+            self.box = None     # tracking lost → full-frame detection next frame
+            return
+
+        points = np.concatenate([a[:, :2] for a in arrays])
+        lo = points.min(axis=0)
+        hi = points.max(axis=0)
+
+        # Keep the current crop while the landmarks sit comfortably inside it,
+        # so the model sees a stable window between frames.
+        if self.box is not None:
+            x0, y0, x1, y1 = self.box
+            inset = 0.1 * min(x1 - x0, y1 - y0)
+            if lo[0] > x0 + inset and lo[1] > y0 + inset and hi[0] < x1 - inset and hi[1] < y1 - inset:
+                return
+
+        center = (lo + hi) / 2
+        side = max(float((hi - lo).max()) * (1 + 2 * self.margin), self.min_size)
+        x0, y0 = np.clip(center - side / 2, 0.0, 1.0)
+        x1, y1 = np.clip(center + side / 2, 0.0, 1.0)
+        self.box = None if (x1 - x0) >= 0.95 and (y1 - y0) >= 0.95 else (float(x0), float(y0), float(x1), float(y1))
@@ -0,0 +1,135 @@
+import numpy as np
+
+import features
+from filters import LandmarkSmoother
+from models import MODEL_FACTORIES, holistic_groups, landmark_groups
+from roi import InferenceRegion
+
+# =====================================================
+# 🗓️ Multi-Model Scheduling
+# =====================================================
+# Most exercises need one model, which the engine runs on every frame.
+# An exercise needing several declares ``schedule``: model kind → rate in
+# Hz (None = every frame, 0 = only while ``exercise.wants(kind)``). A rate
+# is a ceiling: a model runs on the first frame after its next slot and
+# its last landmarks are held in between, so adding a model adds a
+# bounded cost.
+#
+# Hands get their crop from the pose wrists when pose is scheduled too.
+# When pose and hands run at the same rate a single Holistic graph can
+# replace them (it derives the hand crops from pose internally); the
+# start event's "holistic" option forces it on or off.
+
+HOLISTIC_KINDS = ("pose", "hands", "face_mesh")
+VISIBILITY_THRESHOLD = 0.5
+RATE_SLACK = 0.9        # a model may run this fraction of its period after its last run
+
+# Hand box from a pose arm: centred past the wrist (away from the elbow),
+# sides relative to the forearm length
+HAND_REACH = 0.4
+HAND_SIDE = 1.6
+MIN_HAND_SIDE = 0.08
+
+POSE_ARMS = ((features.LEFT_WRIST, features.LEFT_ELBOW), (features.RIGHT_WRIST, features.RIGHT_ELBOW))
+
+
+def hand_box(pose):
+    """Normalized ``(x0, y0, x1, y1)`` around both visible hands of a pose (N, 4) array, or None."""
+    corners = []
+    for wrist, elbow in POSE_ARMS:
+        if min(pose[wrist, 3], pose[elbow, 3]) < VISIBILITY_THRESHOLD:
+            continue
+        forearm = pose[wrist, :2] - pose[elbow, :2]
+        center = pose[wrist, :2] + HAND_REACH * forearm
+        half = max(float(np.linalg.norm(forearm)) * HAND_SIDE, MIN_HAND_SIDE) / 2
+        corners += [center - half, center + half]
+    if not corners:
+        return None
+    x0, y0 = np.clip(np.min(corners, axis=0), 0.0, 1.0)
+    x1, y1 = np.clip(np.max(corners, axis=0), 0.0, 1.0)
+    if x1 - x0 < 0.01 or y1 - y0 < 0.01:
+        return None     # both hands off frame
+    return float(x0), float(y0), float(x1), float(y1)
+
+
+def run_model(model, kind, rgb, region, smoother, timestamp):
+    """Run ``model`` on one RGB frame; returns its full-frame landmark arrays.
+
+    Process-pool results already carry arrays and are used as they are.
+    Returns None when a process-pool model skipped the frame (inference.Worker.call).
+    """
+    model_input, box = region.prepare(rgb)
+    results = model.process(model_input)
+    if results is None:
+        return None
+    remote = getattr(results, "arrays", None)
+    arrays = features.to_arrays(kind, remote if remote is not None else landmark_groups(kind, results))
+    arrays = smoother.update(region.to_full_frame(arrays, box), timestamp)
+    region.update(arrays)
+    return arrays
+
+
+class ModelScheduler:
+    """Runs the models an exercise schedules, each at its own rate."""
+
+    def __init__(self, exercise, holistic=None, available=MODEL_FACTORIES):
+        self.rates = {exercise.model: None, **exercise.schedule}
+        periodic = {self.rates.get(kind, 0) for kind in ("pose", "hands")}
+        if holistic is None:
+            holistic = "pose" in self.rates and "hands" in self.rates and len(periodic) == 1
+        self.holistic = bool(holistic) and "holistic" in available
+        self.next_run = {kind: 0.0 for kind in self.rates}
+        self.last = {kind: [] for kind in self.rates}     # kind -> last landmark arrays
+        self.smoothers = {kind: LandmarkSmoother(smooth=False) for kind in self.rates}
+        self.regions = {kind: InferenceRegion() for kind in self.rates}
+        self.runs = {kind: 0 for kind in self.rates}
+        if "pose" in self.rates and "hands" in self.regions:
+            self.regions["hands"] = InferenceRegion(crop=True)
+
+    @property
+    def model_kinds(self):
+        """Pool model kinds this schedule borrows."""
+        if self.holistic:
+            return ["holistic"] + [kind for kind in self.rates if kind not in HOLISTIC_KINDS]
+        return list(self.rates)
+
+    def due(self, exercise, timestamp):
+        """Kinds to run on the frame taken at ``timestamp``."""
+        due = []
+        for kind, rate in self.rates.items():
+            if rate == 0:
+                if exercise.wants(kind):
+                    due.append(kind)
+                else:
+                    self.last[kind] = []     # nothing stale once no longer wanted
+            elif rate is None or timestamp >= self.next_run[kind]:
+                due.append(kind)
+        return due
+
+    def run(self, session, rgb, due, timestamp):
+        """Run the ``due`` kinds on ``rgb``; returns ``{kind: arrays}`` for all kinds."""
+        if self.holistic and any(kind in HOLISTIC_KINDS for kind in due):
+            results = session.model("holistic").process(rgb)
+            for kind, groups in holistic_groups(results).items():
+                if self.rates.get(kind, 0) != 0 or kind in due:
+                    self._store(kind, features.to_arrays(kind, groups), timestamp)
+            due = [kind for kind in due if kind not in HOLISTIC_KINDS]
+
+        # Pose first, so the hands crop comes from this frame's wrists
+        for kind in sorted(due, key=lambda kind: kind != "pose"):
+            if kind == "hands" and "pose" in self.rates and self.last["pose"]:
+                box = hand_box(self.last["pose"][0])
+                if box is not None:
+                    self.regions["hands"].box = box     # else the hands' own last crop
+            arrays = run_model(session.model(kind), kind, rgb, self.regions[kind],
+                               self.smoothers[kind], timestamp)
+            if arrays is not None:      # a skipped frame keeps the last landmarks
+                self._store(kind, arrays, timestamp)
+        return dict(self.last)
+
+    def _store(self, kind, arrays, timestamp):
+        self.last[kind] = arrays
+        self.runs[kind] += 1
+        if self.rates[kind]:
+            # A little early rather than a frame late under camera jitter
+            self.next_run[kind] = timestamp + RATE_SLACK / self.rates[kind]
@@ -0,0 +1,169 @@
+import threading
+
+from camera import get_camera, release_camera
+from metrics import pipeline_metrics
+from models import model_pool
+from pipeline import Pipeline
+from supervisor import supervisor
+
+# =====================================================
+# 👥 Per-Client Exercise Sessions
+# =====================================================
+# Every socket connection (keyed by sid) gets its own exercise plugin,
+# frame source and borrowed MediaPipe graphs, and all emits for that
+# session go only to that client's room. Its pipeline threads are
+# supervised under its sid (supervisor.py). A pipeline whose stage fails
+# is torn down (camera released, stage closers run) right away. A closed
+# session refuses to start again or borrow models, so a start racing a
+# disconnect cannot leave a pipeline nothing will stop.
+
+
+class Session:
+    """Exercise plugin, frame source and models belonging to one client."""
+
+    def __init__(self, sid, pool=model_pool, supervisor=supervisor):
+        self.sid = sid
+        self.pool = pool
+        self.supervisor = supervisor
+        self.models = {}
+        self.camera = None
+        self.pipeline = None
+        self.exercise = None
+        self.options = None
+        self.delivery = None    # DeliveryControl while the client acks frames
+        self.closed = False
+        self.lock = threading.Lock()
+        self.models_lock = threading.Lock()     # models and closed; pipeline threads take it too
+
+    def model(self, kind):
+        """The session's own graph of ``kind``, borrowed from the pool on first use.
+
+        Raises RuntimeError once the session is closed.
+        """
+        with self.models_lock:
+            if self.closed:
+                raise RuntimeError("Session is closed")
+            if kind not in self.models:
+                self.models[kind] = self.pool.acquire(kind)
+            return self.models[kind]
+
+    def start(self, exercise, stages_fn, options, camera=None, on_error=None):
+        """Make ``exercise`` (a plugin instance) current.
+
+        If a pipeline with the same options is already running the plugin
+        is simply swapped in; otherwise the pipeline is rebuilt with
+        ``stages_fn(session)``. ``camera`` overrides the frame source
+        normally chosen from ``options["device"]``; either is released
+        (camera.release_camera) when the pipeline stops. If a stage fails,
+        ``on_error(stage, error)`` is called and the pipeline is torn down.
+
+        Raises RuntimeError while a worker of the previous pipeline has
+        not exited yet, so one session never runs two loops, and once the
+        session is closed.
+        """
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Session is closed")
+            self.exercise = exercise
+            if self.pipeline is not None and self.pipeline.is_running() and self.options == options:
+                return
+            self._stop_pipeline()
+            if self.supervisor.alive(self.sid):
+                self.exercise = None
+                raise RuntimeError("The previous exercise is still stopping, try again in a moment")
+            self.options = options
+            try:
+                self.camera = camera or get_camera(options.get("device", 0), options.get("realtime", True),
+                                                   options.get("profile"))
+                stages = stages_fn(self)
+            except Exception:
+                self._stop_pipeline()   # release the camera if it was taken
+                self.exercise = None
+                raise
+            pipeline = Pipeline(stages, metrics=pipeline_metrics, owner=self.sid, supervisor=self.supervisor)
+            pipeline.on_error = lambda stage, error: self._failed(pipeline, stage, error, on_error)
+            self.pipeline = pipeline.start()
+
+    def _failed(self, pipeline, stage, error, on_error):
+        """Called on the failing stage's thread; the teardown joins it, so it runs on another."""
+        if on_error is not None:
+            on_error(stage, error)
+        threading.Thread(target=self._stop_failed, args=(pipeline,), name=f"teardown-{self.sid}",
+                         daemon=True).start()
+
+    def _stop_failed(self, pipeline):
+        with self.lock:
+            if self.pipeline is pipeline:
+                self._stop_pipeline()
+                self.exercise = None
+
+    def stop(self, name=None):
+        """Stop the running exercise, optionally only if it is ``name``."""
+        with self.lock:
+            if name is None or (self.exercise is not None and self.exercise.name == name):
+                self._stop_pipeline()
+                self.exercise = None
+
+    def _stop_pipeline(self):
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        self.delivery = None
+        if self.camera is not None:
+            release_camera(self.camera, (self.options or {}).get("profile"))
+        self.camera = None
+        self.pipeline = None
+        self.options = None
+
+    def close(self):
+        """Stop for good and hand borrowed models back to the pool."""
+        with self.models_lock:
+            self.closed = True
+        with self.lock:
+            self._stop_pipeline()
+            self.exercise = None
+        with self.models_lock:
+            models, self.models = self.models, {}
+        for kind, model in models.items():
+            self.pool.release(kind, model)
+
+    def stats(self):
+        return {
+            "exercise": self.exercise.name if self.exercise is not None else None,
+            "pipeline": self.pipeline.stats() if self.pipeline is not None else {},
+            "delivery": self.delivery.stats() if self.delivery is not None else None,
+            "workers": len(self.supervisor.alive(self.sid)),
+            "camera": self.camera.stats() if hasattr(self.camera, "stats") else None,
+        }
+
+
+class SessionManager:
+    """Registry of live sessions keyed by socket sid."""
+
+    def __init__(self, pool=model_pool):
+        self.pool = pool
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def get(self, sid):
+        with self.lock:
+            session = self.sessions.get(sid)
+            if session is None:
+                session = self.sessions[sid] = Session(sid, self.pool)
+            return session
+
+    def close(self, sid):
+        with self.lock:
+            session = self.sessions.pop(sid, None)
+        if session is not None:
+            session.close()
+
+    def active(self):
+        """Number of sessions with a running pipeline."""
+        with self.lock:
+            return sum(1 for session in self.sessions.values() if session.pipeline is not None)
+
+    def __len__(self):
+        return len(self.sessions)
+
+
+sessions = SessionManager()
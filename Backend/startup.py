@@ -0,0 +1,20 @@
+import time
+
+# =====================================================
+# ⏱️ Startup Report
+# =====================================================
+# Seconds since the server process started importing, per phase, so cold
+# starts on the kiosks can be compared across releases.
+
+STARTED = time.perf_counter()
+phases = {}
+
+
+def mark(name, seconds=None):
+    """Record ``name`` at the current time (or an explicit duration)."""
+    phases[name] = round(time.perf_counter() - STARTED if seconds is None else seconds, 3)
+    print(f"⏱️ {name}: {phases[name]:.3f}s")
+
+
+def report():
+    return dict(phases)
@@ -0,0 +1,147 @@
+import threading
+import time
+import traceback
+from collections import deque
+
+import numpy as np
+
+# =====================================================
+# 🧵 Worker Supervisor
+# =====================================================
+# Every exercise worker thread (the pipeline stages) is started through
+# the supervisor and registered under its owner, the session's sid. A
+# pipeline stop joins its workers against one shared deadline; workers
+# still alive after it are reported as overdue and stay listed until they
+# really exit. A session refuses to start a new loop while one of its old
+# workers is still running, so two loops never share its camera and
+# models. A worker that raises is logged with its traceback and counted
+# as crashed, and its ``on_crash`` callback stops the rest of its owner's
+# loop. stats() reports how many workers exist and how long loops live.
+
+LIFETIME_HISTORY = 256      # finished workers kept for the lifetime summary
+CRASH_HISTORY = 16          # recent crashes kept for stats()
+
+
+class Worker:
+    """One supervised thread."""
+
+    def __init__(self, owner, name):
+        self.owner = owner
+        self.name = name
+        self.thread = None
+        self.started = time.monotonic()
+        self.stopping = None        # when a stop was requested
+        self.overdue = False        # still alive after its stop deadline
+        self.error = None           # traceback when the worker crashed
+
+    def age(self, now=None):
+        return (time.monotonic() if now is None else now) - self.started
+
+
+class Supervisor:
+    """Owns every exercise worker thread, grouped by owner."""
+
+    def __init__(self):
+        self.workers = {}       # owner -> [Worker] still alive
+        self.lifetimes = deque(maxlen=LIFETIME_HISTORY)
+        self.started = 0
+        self.finished = 0
+        self.overdue = 0        # workers that outlived their stop deadline
+        self.crashed = 0
+        self.crashes = deque(maxlen=CRASH_HISTORY)
+        self.lock = threading.Lock()
+
+    def spawn(self, owner, name, target, *args, on_crash=None):
+        """Run ``target(*args)`` on a daemon thread owned by ``owner``.
+
+        If ``target`` raises, the crash is recorded and ``on_crash(worker,
+        error)`` is called on the worker's thread.
+        """
+        worker = Worker(owner, name)
+
+        def run():
+            try:
+                target(*args)
+            except Exception as e:
+                self._crashed(worker)
+                if on_crash is not None:
+                    on_crash(worker, e)
+            finally:
+                self._exited(worker)
+
+        worker.thread = threading.Thread(target=run, name=name, daemon=True)
+        with self.lock:
+            self.workers.setdefault(owner, []).append(worker)
+            self.started += 1
+        worker.thread.start()
+        return worker
+
+    def _crashed(self, worker):
+        worker.error = traceback.format_exc()
+        with self.lock:
+            self.crashed += 1
+            self.crashes.append({"worker": worker.name, "owner": worker.owner,
+                                 "error": worker.error.strip().splitlines()[-1], "at": time.time()})
+        print(f"💥 {worker.name} ({worker.owner}) crashed after {worker.age():.1f}s\n{worker.error}", end="")
+
+    def _exited(self, worker):
+        with self.lock:
+            owned = self.workers.get(worker.owner, [])
+            if worker in owned:
+                owned.remove(worker)
+            if not owned:
+                self.workers.pop(worker.owner, None)
+            if worker.error is None:
+                self.finished += 1
+            self.lifetimes.append(worker.age())
+        if worker.overdue:
+            print(f"🧵 {worker.name} ({worker.owner}) exited {time.monotonic() - worker.stopping:.1f}s after stop")
+
+    def join(self, workers, timeout=2.0):
+        """Join ``workers`` against one deadline; returns those still alive."""
+        now = time.monotonic()
+        deadline = now + timeout
+        current = threading.current_thread()
+        for worker in workers:
+            worker.stopping = worker.stopping or now
+            if worker.thread is not current:
+                worker.thread.join(max(deadline - time.monotonic(), 0))
+
+        alive = [w for w in workers if w.thread.is_alive() and w.thread is not current]
+        for worker in alive:
+            if not worker.overdue:
+                worker.overdue = True
+                with self.lock:
+                    self.overdue += 1
+                print(f"⚠️ {worker.name} ({worker.owner}) still running {timeout:.1f}s after stop")
+        return alive
+
+    def alive(self, owner):
+        """Workers of ``owner`` that have not exited yet."""
+        with self.lock:
+            return list(self.workers.get(owner, []))
+
+    def stats(self):
+        now = time.monotonic()
+        with self.lock:
+            workers = [w for owned in self.workers.values() for w in owned]
+            lifetimes = list(self.lifetimes)
+            totals = {"started": self.started, "finished": self.finished, "overdue": self.overdue,
+                      "crashed": self.crashed}
+            crashes = list(self.crashes)
+        ages = [w.age(now) for w in workers]
+        return {
+            "workers": len(workers),
+            "owners": len({w.owner for w in workers}),
+            "stopping": sum(1 for w in workers if w.stopping is not None),
+            "oldest_s": round(max(ages), 1) if ages else None,
+            **totals,
+            "recent_crashes": crashes,
+            "lifetime_s": {
+                "p50": round(float(np.percentile(lifetimes, 50)), 1),
+                "max": round(max(lifetimes), 1),
+            } if lifetimes else None,
+        }
+
+
+supervisor = Supervisor()
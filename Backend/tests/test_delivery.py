@@ -0,0 +1,61 @@
+from delivery import DeliveryControl, pace_stage
+from pipeline import DropOldestQueue
+
+LEVELS = [(85, 1.0, 100), (60, 0.5, 100), (40, 0.5, 100)]
+
+
+def control(**kwargs):
+    kwargs.setdefault("levels", LEVELS)
+    kwargs.setdefault("adjust_every", 0.0)
+    return DeliveryControl(**kwargs)
+
+
+def test_reserved_frames_count_against_the_cap():
+    delivery = control(max_in_flight=2, start_level=0)
+    assert delivery.reserve(1, 0.0, now=1.0)
+    assert delivery.reserve(2, 0.0, now=1.1)
+    assert not delivery.reserve(3, 0.0, now=1.2)      # neither sent yet, both hold a slot
+    delivery.sent(1, now=1.3)
+    delivery.ack(1, now=1.35)
+    assert delivery.reserve(3, 1.3, now=1.4)
+    assert delivery.stats()["in_flight"] == 2
+
+
+def test_released_frames_free_their_slot():
+    delivery = control(max_in_flight=1, start_level=0)
+    assert delivery.reserve(1, 0.0, now=1.0)
+    delivery.release(1)
+    assert delivery.reserve(2, 0.0, now=1.1)
+    assert delivery.lost == 0
+
+
+def test_pace_stage_releases_packets_dropped_downstream():
+    delivery = control(max_in_flight=2, start_level=0)
+    pace = pace_stage(delivery)
+    queue = DropOldestQueue(maxsize=1)
+    queue.put(pace({"seq": 1, "timestamp": 0.0}))
+    delivery.last_sent = 0.0        # skip the fps gap
+    queue.put(pace({"seq": 2, "timestamp": 0.0}))      # evicts frame 1
+    assert delivery.stats()["in_flight"] == 1
+
+
+def test_acks_step_the_level_by_frame_age():
+    delivery = control(target_age=0.1, start_level=1)
+    delivery.reserve(1, 0.0, now=10.0)
+    delivery.ack(1, now=10.5)                           # 10 s old: too slow
+    assert delivery.level == 2
+
+    delivery = control(target_age=0.1, start_level=1)
+    delivery.reserve(1, 10.0, now=10.0)
+    delivery.ack(1, now=10.01)                          # fresh: step back up
+    assert delivery.level == 0
+
+
+def test_unacked_frames_time_out_as_lost():
+    delivery = control(max_in_flight=1, ack_timeout=2.0, start_level=0)
+    assert delivery.reserve(1, 0.0, now=1.0)
+    delivery.sent(1, now=1.0)
+    assert not delivery.reserve(2, 0.0, now=2.0)
+    assert delivery.reserve(2, 0.0, now=3.5)
+    assert delivery.lost == 1
+    assert delivery.level == 1
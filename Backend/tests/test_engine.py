@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import pytest
+
+import engine
+import recording
+from broadcast import watch_room
+
+
+def test_default_camera_is_allowed():
+    assert engine.stream_options({})["device"] == 0
+
+
+@pytest.mark.parametrize("device", ["/etc/passwd", "rtsp://example/stream", "0", True, 99, -1, None])
+def test_clients_cannot_open_arbitrary_devices(device):
+    with pytest.raises(RuntimeError):
+        engine.stream_options({"device": device})
+
+
+@pytest.mark.parametrize("data, scale, stride", [
+    ({}, 1.0, 1),
+    ({"inference_scale": 0.5, "stride": 3}, 0.5, 3),
+    ({"inference_scale": 0, "stride": 0}, 0.1, 1),
+    ({"inference_scale": 4, "stride": 1000}, 1.0, 10),
+    ({"inference_scale": "0.5", "stride": "2"}, 0.5, 2),
+])
+def test_scale_and_stride_are_clamped(data, scale, stride):
+    options = engine.stream_options(data)
+    assert (options["scale"], options["stride"]) == (scale, stride)
+
+
+@pytest.mark.parametrize("data", [
+    {"inference_scale": "fast"}, {"inference_scale": None}, {"inference_scale": float("nan")},
+    {"stride": "2.5"}, {"stride": [2]}, {"stride": float("inf")},
+])
+def test_bad_numbers_are_start_errors(data):
+    with pytest.raises(RuntimeError):
+        engine.stream_options(data)
+
+
+def test_recordings_are_named_under_the_server_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(recording, "RECORDINGS_DIR", str(tmp_path))
+    assert engine.stream_options({"record": "session-1"})["record"] == str(tmp_path / "session-1")
+
+    (tmp_path / "session-1").mkdir()
+    (tmp_path / "session-1" / recording.LANDMARKS_FILE).write_bytes(b"")
+    assert engine.stream_options({"replay": "session-1"})["device"] == str(tmp_path / "session-1")
+
+
+@pytest.mark.parametrize("data", [
+    {"record": "../escape"}, {"record": "/tmp/x"}, {"record": "a" * 65}, {"record": 7},
+    {"replay": "../escape"}, {"replay": "missing"}, {"replay": "same", "record": "same"},
+])
+def test_bad_recording_names_are_start_errors(data, tmp_path, monkeypatch):
+    monkeypatch.setattr(recording, "RECORDINGS_DIR", str(tmp_path))
+    with pytest.raises(RuntimeError):
+        engine.stream_options(data)
+
+
+def test_watchers_get_frames_in_their_own_room():
+    sent = []
+    socketio = SimpleNamespace(emit=lambda event, data, to=None: sent.append((event, to)))
+    exercise = SimpleNamespace(event="exercise_frame", frame_key="frame", interval=0)
+    emit = engine.emit_stage(socketio, to="patient", watchers=watch_room("patient"))
+
+    emit({"exercise": exercise, "payload": {"count": 1}, "encoded": "jpeg"})
+    assert sent == [("exercise_frame", "patient"), ("exercise_frame", "watch:patient")]
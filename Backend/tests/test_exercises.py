@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import features
+from exercises import FingerTap
+
+SIZE = (480, 640)
+
+
+def hand(distance_px, target=0):
+    """Hand with the target fingertip ``distance_px`` from the thumb tip and the others far away."""
+    points = np.zeros((21, 3), dtype=np.float32)
+    thumb = np.array([0.5, 0.5])
+    points[features.THUMB_TIP, :2] = thumb
+    for i, tip in enumerate(features.FINGER_TIPS):
+        offset = distance_px if i == target else 200
+        points[tip, :2] = thumb + (offset / SIZE[1], 0.0)
+    return points
+
+
+def feed(exercise, frames):
+    payload = None
+    for timestamp, distance_px in frames:
+        payload = exercise.update([hand(distance_px, exercise.target)], {"timestamp": timestamp, "size": SIZE})
+    return payload
+
+
+def test_tap_duration_is_interpolated_between_frames():
+    # 30 fps: touch_px (40) is crossed a quarter of the way into the second
+    # interval on the way in and halfway through the fifth on the way out
+    exercise = FingerTap()
+    payload = feed(exercise, [(0.0, 80), (1 / 30, 80), (2 / 30, 0), (3 / 30, 0), (4 / 30, 0), (5 / 30, 60)])
+    start = 1 / 30 + (80 - 40) / 80 * (1 / 30)
+    end = 4 / 30 + (0 - 40) / (0 - 60) * (1 / 30)
+    assert payload["taps"] == [{"finger": "Index", "duration": round(end - start, 3)}]
+    assert payload["target"] == "Middle"
+
+
+def test_tap_without_previous_frame_uses_frame_time():
+    exercise = FingerTap()
+    payload = feed(exercise, [(1.0, 0), (1.2, 0), (1.5, 80)])
+    # Onset on the first frame (nothing to interpolate from), offset at 40/80 of 1.2 → 1.5
+    assert payload["taps"][0]["duration"] == pytest.approx(1.35 - 1.0, abs=1e-3)
+
+
+def test_frames_without_a_hand_break_interpolation():
+    exercise = FingerTap()
+    feed(exercise, [(0.0, 80)])
+    exercise.update([], {"timestamp": 0.1, "size": SIZE})
+    payload = feed(exercise, [(0.2, 0), (0.3, 80)])
+    assert exercise.taps == payload["taps"]
+    assert payload["taps"][0]["duration"] == pytest.approx(0.25 - 0.2, abs=1e-3)
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import features
+
+# Reference formulas as the original per-exercise scripts computed them,
+# point by point on landmark objects.
+
+
+def landmark_list(points):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z, visibility=v) for x, y, z, v in points])
+
+
+def baseline_hand_state(landmarks):
+    curled = sum(1 for tip in [8, 12, 16, 20] if landmarks.landmark[tip].y > landmarks.landmark[tip - 2].y)
+    if curled == 0:
+        return "Fully Open"
+    if curled == 4:
+        return "Fully Closed"
+    return "Half Closed"
+
+
+def baseline_wrist_angle(landmarks):
+    wrist, middle_mcp = landmarks.landmark[0], landmarks.landmark[9]
+    return np.arctan2(middle_mcp.y - wrist.y, middle_mcp.x - wrist.x) * 180 / np.pi
+
+
+def baseline_accuracy(left, right):
+    normalized = min(np.linalg.norm(np.array(left) - np.array(right)) / 0.25, 1.0)
+    return round((1 - normalized) * 100, 2)
+
+
+def random_hand(rng):
+    return landmark_list(rng.random((21, 4)).astype(np.float32).tolist())
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_hand_state_matches_baseline(seed):
+    hand = random_hand(np.random.default_rng(seed))
+    assert features.hand_state(features.to_array(hand)) == baseline_hand_state(hand)
+
+
+@pytest.mark.parametrize("curled, state", [(0, "Fully Open"), (2, "Half Closed"), (4, "Fully Closed")])
+def test_hand_state_counts_curled_fingers(curled, state):
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[features.FINGER_PIPS, 1] = 0.5
+    points[features.FINGER_TIPS[:curled], 1] = 0.6     # tip below its PIP
+    points[features.FINGER_TIPS[curled:], 1] = 0.4
+    assert features.hand_state(points) == state
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_wrist_angle_matches_baseline(seed):
+    hand = random_hand(np.random.default_rng(seed))
+    assert features.wrist_angle(features.to_array(hand)) == pytest.approx(baseline_wrist_angle(hand), abs=1e-4)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_proximity_accuracy_matches_baseline(seed):
+    pose = landmark_list(np.random.default_rng(seed).uniform(0.3, 0.6, (33, 4)).tolist())
+    left = (pose.landmark[features.LEFT_INDEX].x, pose.landmark[features.LEFT_INDEX].y)
+    right = (pose.landmark[features.RIGHT_INDEX].x, pose.landmark[features.RIGHT_INDEX].y)
+    accuracy = features.proximity_accuracy(features.to_array(pose), features.LEFT_INDEX, features.RIGHT_INDEX)
+    assert accuracy == pytest.approx(baseline_accuracy(left, right), abs=0.01)
+
+
+def test_proximity_accuracy_bounds():
+    points = np.zeros((2, 3), dtype=np.float32)
+    assert features.proximity_accuracy(points, 0, 1) == 100.0
+    points[1, 0] = 0.5
+    assert features.proximity_accuracy(points, 0, 1) == 0.0
+
+
+def test_to_array_from_landmark_list():
+    hand = landmark_list([(0.1, 0.2, 0.3, 0.9), (0.4, 0.5, 0.6, 0.1)])
+    array = features.to_array(hand)
+    assert array.shape == (2, 3) and array.dtype == np.float32
+    np.testing.assert_allclose(array, [(0.1, 0.2, 0.3), (0.4, 0.5, 0.6)], rtol=1e-6)
+    np.testing.assert_allclose(features.to_array(hand, with_visibility=True)[:, 3], [0.9, 0.1], rtol=1e-6)
+
+
+def test_to_arrays_keeps_visibility_for_pose_only():
+    group = landmark_list([(0.1, 0.2, 0.3, 0.9)] * 33)
+    assert features.to_arrays("pose", [group])[0].shape == (33, 4)
+    assert features.to_arrays("hands", [group])[0].shape == (33, 3)
+
+
+def test_to_array_passes_arrays_through():
+    array = np.arange(8, dtype=np.float32).reshape(2, 4)
+    assert features.to_array(array, with_visibility=True) is array
+    np.testing.assert_array_equal(features.to_array(array), array[:, :3])
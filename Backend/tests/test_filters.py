@@ -0,0 +1,45 @@
+import numpy as np
+
+from filters import LandmarkSmoother
+
+
+def hand(x, y, visibility=None):
+    points = np.full((21, 3), (x, y, 0.0), dtype=np.float32)
+    points[:, :2] += np.linspace(0, 0.05, 21, dtype=np.float32)[:, None]
+    if visibility is not None:
+        points = np.hstack([points, np.full((21, 1), visibility, dtype=np.float32)])
+    return points
+
+
+def test_swapped_hands_keep_their_filters():
+    smoother = LandmarkSmoother(stride=1, smooth=True)
+    left, right = hand(0.2, 0.5), hand(0.7, 0.5)
+    smoother.update([left, right], 0.0)
+    smoother.update([left, right], 1 / 30)
+    out = smoother.update([right, left], 2 / 30)
+    # Each output stays on its own hand instead of blending the two
+    np.testing.assert_allclose(out[0], right, atol=1e-5)
+    np.testing.assert_allclose(out[1], left, atol=1e-5)
+
+
+def test_new_group_far_away_starts_a_fresh_filter():
+    smoother = LandmarkSmoother(stride=1, smooth=True)
+    smoother.update([hand(0.2, 0.5)], 0.0)
+    jumped = hand(0.8, 0.2)
+    np.testing.assert_array_equal(smoother.update([jumped], 1 / 30)[0], jumped)
+
+
+def test_visibility_is_passed_through_not_filtered():
+    smoother = LandmarkSmoother(stride=3, smooth=True)
+    smoother.update([hand(0.2, 0.5, visibility=0.9)], 0.0)
+    out = smoother.update([hand(0.3, 0.5, visibility=0.1)], 1 / 30)[0]
+    assert out.shape == (21, 4)
+    np.testing.assert_array_equal(out[:, 3], np.float32(0.1))
+    predicted = smoother.predict(2 / 30)[0]
+    np.testing.assert_array_equal(predicted[:, 3], np.float32(0.1))
+    assert predicted[0, 0] > out[0, 0]     # x, y, z still extrapolated
+
+
+def test_unsmoothed_arrays_pass_through():
+    arrays = [hand(0.2, 0.5)]
+    assert LandmarkSmoother(smooth=False).update(arrays, 0.0) is arrays
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+import overlay
+
+RED = [0, 0, 255]
+LINE = [224, 224, 224]
+
+
+@pytest.fixture(autouse=True)
+def chain_segments(monkeypatch):
+    # 0-1-2 chain instead of MediaPipe's connections
+    monkeypatch.setitem(overlay._segments, "test", np.array([[0, 1], [1, 2]], dtype=np.intp))
+
+
+def draw(array):
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    overlay.draw_overlay(image, "test", [np.array(array, dtype=np.float32)])
+    return image
+
+
+def test_points_and_segments_are_drawn():
+    image = draw([(0.1, 0.1, 0.0), (0.5, 0.5, 0.0), (0.9, 0.9, 0.0)])
+    assert image[10, 10].tolist() == RED
+    assert image[50, 50].tolist() == RED
+    assert image[30, 30].tolist() == LINE
+
+
+def test_low_visibility_points_are_left_out_with_their_segments():
+    image = draw([(0.1, 0.1, 0.0, 1.0), (0.5, 0.5, 0.0, 0.1), (0.9, 0.9, 0.0, 1.0)])
+    assert image[10, 10].tolist() == RED
+    assert image[50, 50].tolist() == [0, 0, 0]
+    assert image[30, 30].tolist() == [0, 0, 0]
+
+
+def test_points_outside_the_frame_are_left_out():
+    image = draw([(0.1, 0.1, 0.0), (1.5, 0.5, 0.0), (0.9, 0.9, 0.0)])
+    assert image[10, 10].tolist() == image[90, 90].tolist() == RED
+    assert image[20:80, 40:].sum() == 0      # neither segment to the off-frame point
@@ -0,0 +1,18 @@
+import numpy as np
+
+from recording import Recorder, load_landmarks
+
+
+def test_recordings_keep_each_groups_columns(tmp_path):
+    pose = np.random.rand(33, 4).astype(np.float32)
+    hand = np.random.rand(21, 3).astype(np.float32)
+    recorder = Recorder(str(tmp_path))
+    recorder.write(np.zeros((48, 64, 3), dtype=np.uint8), 0.0, "pose", [pose])
+    recorder.write(np.zeros((48, 64, 3), dtype=np.uint8), 0.1, "hands", [hand, hand])
+    recorder.close()
+
+    timestamps, kinds, per_frame, meta = load_landmarks(str(tmp_path))
+    assert kinds == ["pose", "hands"]
+    np.testing.assert_array_equal(per_frame[0][0], pose)    # visibility survives
+    assert [group.shape for group in per_frame[1]] == [(21, 3), (21, 3)]
+    np.testing.assert_array_equal(per_frame[1][1], hand)
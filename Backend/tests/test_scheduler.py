@@ -0,0 +1,176 @@
+from types import MappingProxyType, SimpleNamespace
+
+import numpy as np
+import pytest
+
+import features
+from exercises import Exercise
+from filters import LandmarkSmoother
+from roi import InferenceRegion
+from scheduler import ModelScheduler, hand_box, run_model
+
+FACTORIES = {"hands": None, "pose": None, "face_mesh": None, "holistic": None}
+
+
+class Scheduled(Exercise):
+    name = "scheduled"
+    model = "pose"
+    schedule = MappingProxyType({"hands": 10.0, "face_mesh": 0})
+    face = False
+
+    def wants(self, kind):
+        return kind == "face_mesh" and self.face
+
+
+def landmark_list(points):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=0.0, visibility=v) for x, y, v in points])
+
+
+def pose_points(wrist=(0.5, 0.5), elbow=(0.5, 0.7), visibility=1.0):
+    points = [(0.5, 0.5, 0.0)] * 33
+    points[features.LEFT_WRIST] = (*wrist, visibility)
+    points[features.LEFT_ELBOW] = (*elbow, visibility)
+    return points
+
+
+class FakeModel:
+    """Returns canned MediaPipe-style results and records the input shape."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.inputs = []
+
+    def process(self, rgb):
+        self.inputs.append(rgb.shape)
+        if self.kind == "pose":
+            return SimpleNamespace(pose_landmarks=landmark_list(pose_points()))
+        group = landmark_list([(0.5, 0.5, 1.0)] * 21)
+        if self.kind == "hands":
+            return SimpleNamespace(multi_hand_landmarks=[group])
+        return SimpleNamespace(multi_face_landmarks=[group])
+
+
+class FakeSession:
+    def __init__(self):
+        self.models = {}
+
+    def model(self, kind):
+        return self.models.setdefault(kind, FakeModel(kind))
+
+
+def test_due_respects_rates():
+    exercise = Scheduled()
+    scheduler = ModelScheduler(exercise, holistic=False, available=FACTORIES)
+    session = FakeSession()
+    rgb = np.zeros((100, 100, 3), dtype=np.uint8)
+
+    ran = []
+    for frame in range(30):     # one second at 30 fps
+        timestamp = frame / 30
+        due = scheduler.due(exercise, timestamp)
+        ran.append(due)
+        scheduler.run(session, rgb, due, timestamp)
+
+    assert all("pose" in due for due in ran)                # the exercise's own model: every frame
+    assert sum("hands" in due for due in ran) == 10         # 10 Hz
+    assert not any("face_mesh" in due for due in ran)       # on demand, never wanted
+    assert scheduler.runs == {"pose": 30, "hands": 10, "face_mesh": 0}
+
+
+def test_held_landmarks_between_runs_and_on_demand_model():
+    exercise = Scheduled()
+    scheduler = ModelScheduler(exercise, holistic=False, available=FACTORIES)
+    session = FakeSession()
+    rgb = np.zeros((100, 100, 3), dtype=np.uint8)
+
+    scheduler.run(session, rgb, scheduler.due(exercise, 0.0), 0.0)
+    due = scheduler.due(exercise, 0.01)
+    assert "hands" not in due
+    results = scheduler.run(session, rgb, due, 0.01)
+    assert len(results["hands"]) == 1                       # held from the previous run
+
+    exercise.face = True
+    assert "face_mesh" in scheduler.due(exercise, 0.02)
+    exercise.face = False
+    scheduler.last["face_mesh"] = ["stale"]
+    assert "face_mesh" not in scheduler.due(exercise, 0.03)
+    assert scheduler.last["face_mesh"] == []
+
+
+def test_hands_are_cropped_around_the_pose_wrist():
+    exercise = Scheduled()
+    scheduler = ModelScheduler(exercise, holistic=False, available=FACTORIES)
+    session = FakeSession()
+    rgb = np.zeros((100, 200, 3), dtype=np.uint8)
+
+    scheduler.run(session, rgb, ["pose", "hands"], 0.0)
+    box = hand_box(features.to_array(landmark_list(pose_points()), with_visibility=True))
+    assert scheduler.regions["hands"].box == box
+    x0, y0, x1, y1 = box
+    assert session.models["hands"].inputs[-1][:2] == (int(y1 * 100) - int(y0 * 100), int(x1 * 200) - int(x0 * 200))
+    assert session.models["pose"].inputs[-1][:2] == (100, 200)
+
+
+def test_run_model_maps_remote_arrays_out_of_the_crop():
+    hand = np.tile(np.array([0.5, 0.5, 0.1, 1.0], dtype=np.float32), (21, 1))
+    model = SimpleNamespace(process=lambda rgb: SimpleNamespace(arrays=[hand]))
+    region = InferenceRegion(crop=True)
+    region.box = (0.2, 0.4, 0.6, 0.8)
+
+    arrays = run_model(model, "hands", np.zeros((100, 100, 3), dtype=np.uint8), region,
+                       LandmarkSmoother(), 0.0)
+    assert arrays[0].shape == (21, 3)
+    assert arrays[0][0] == pytest.approx([0.4, 0.6, 0.04])
+    assert hand[0, 0] == 0.5                                # the worker's array is untouched
+
+
+def test_hand_box_geometry():
+    box = hand_box(features.to_array(landmark_list(pose_points()), with_visibility=True))
+    # Forearm of 0.2 pointing up: centre 0.08 past the wrist, side 0.32
+    assert box == pytest.approx((0.34, 0.26, 0.66, 0.58))
+    hidden = features.to_array(landmark_list(pose_points(visibility=0.1)), with_visibility=True)
+    assert hand_box(hidden) is None
+
+
+@pytest.mark.parametrize("schedule, holistic, kinds", [
+    ({"hands": None}, None, ["holistic"]),                          # same rate: one graph
+    ({"hands": 10.0}, None, ["pose", "hands"]),                     # different rates
+    ({"hands": 10.0}, True, ["holistic"]),                          # forced on
+    ({"hands": None, "face_mesh": 0}, None, ["holistic"]),
+])
+def test_holistic_replaces_pose_and_hands(schedule, holistic, kinds):
+    exercise = type("E", (Scheduled,), {"schedule": MappingProxyType(schedule)})()
+    assert ModelScheduler(exercise, holistic, FACTORIES).model_kinds == kinds
+
+
+def test_holistic_needs_the_factory():
+    exercise = type("E", (Scheduled,), {"schedule": MappingProxyType({"hands": None})})()
+    available = {kind: None for kind in ("hands", "pose")}
+    assert ModelScheduler(exercise, None, available).model_kinds == ["pose", "hands"]
+
+
+def test_engine_borrows_only_scheduled_models(monkeypatch):
+    import engine
+
+    class Holistic(Scheduled):
+        schedule = MappingProxyType({"hands": None})
+
+    class Session:
+        pool = SimpleNamespace(factories=FACTORIES)
+
+        def __init__(self):
+            self.borrowed = []
+
+        def model(self, kind):
+            self.borrowed.append(kind)
+
+        def start(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setitem(engine.EXERCISES, "holistic_test", Holistic)
+    session = Session()
+    engine.start(session, None, "holistic_test")
+    assert session.borrowed == ["holistic"]
+    session = Session()
+    engine.start(session, None, "holistic_test", {"holistic": False})
+    assert session.borrowed == ["pose", "hands"]
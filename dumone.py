@@ -1,64 +1,14 @@
-import cv2
-import mediapipe as mp
-import math
+import os
+import sys
 
-mp_drawing = mp.solutions.drawing_utils
-mp_pose = mp.solutions.pose
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Backend"))
 
-def calculate_angle(a, b, c):
-    # Angle between three points
-    a = [a.x, a.y]
-    b = [b.x, b.y]
-    c = [c.x, c.y]
-    radians = math.atan2(c[1]-b[1], c[0]-b[0]) - math.atan2(a[1]-b[1], a[0]-b[0])
-    angle = abs(radians * 180.0 / math.pi)
-    if angle > 180.0:
-        angle = 360 - angle
-    return angle
+from camera import parse_device
+from engine import run_local  # Shared engine and exercise logic live in Backend/
+from exercises import ArmRaise
 
-cap = cv2.VideoCapture(0)
-
-with mp_pose.Pose(min_detection_confidence=0.7, min_tracking_confidence=0.7) as pose:
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose.process(image)
-
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-
-        if results.pose_landmarks:
-            landmarks = results.pose_landmarks.landmark
-
-            # Left arm key points
-            shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER]
-            elbow = landmarks[mp_pose.PoseLandmark.LEFT_ELBOW]
-            wrist = landmarks[mp_pose.PoseLandmark.LEFT_WRIST]
-            hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP]
-
-            # Calculate angle at shoulder
-            angle = calculate_angle(hip, shoulder, elbow)
-            height_diff = shoulder.y - wrist.y  # Positive if hand is above shoulder
-
-            direction = "Down"
-            if abs(shoulder.x - wrist.x) > abs(shoulder.z - wrist.z):  # Side raise
-                direction = "Side Raise"
-            else:  # Front raise
-                direction = "Front Raise"
-
-            # Display results
-            if height_diff > 0.05:  # Hand raised above shoulder
-                cv2.putText(image, f'{direction} | Angle: {int(angle)}', (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,0), 2)
-            else:
-                cv2.putText(image, 'Lowered', (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
-
-            mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-
-        cv2.imshow('Arm Raise Detection', image)
-        if cv2.waitKey(10) & 0xFF == ord('q'):
-            break
-
-cap.release()
-cv2.destroyAllWindows()
+# Arm raise detection in a local window. The same plugin is served over
+# the socket API as {"exercise": "armraise"}.
+# Pass a recording directory (or another camera index) instead of the webcam: python dumone.py <recording>
+if __name__ == "__main__":
+    run_local(ArmRaise(), "Arm Raise Detection", device=parse_device(sys.argv[1]) if len(sys.argv) > 1 else 0)
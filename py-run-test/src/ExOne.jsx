@@ -2,6 +2,8 @@ import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import io from "socket.io-client";
 import { useSpeechSynthesis } from "react-speech-kit";
+import { STREAM_MODE, ackFrame, frameToSrc, streamOptions } from "./utils/frame";
+import LandmarkOverlay from "./LandmarkOverlay";
 
 const socket = io("http://localhost:5000");
 
@@ -9,6 +11,7 @@ function ExOne() {
   const [completionSpoken, setCompletionSpoken] = useState(false);
 
   const [videoFrame, setVideoFrame] = useState(null);
+  const [landmarkData, setLandmarkData] = useState(null);
   const [rotationCount, setRotationCount] = useState(0);
   const [streaming, setStreaming] = useState(false);
   const [paused, setPaused] = useState(false);
@@ -24,8 +27,10 @@ function ExOne() {
 
   useEffect(() => {
     socket.on("rotation_feed", (data) => {
+      ackFrame(socket, data);
       if (!sessionCompleted && !paused && streaming) {
-        setVideoFrame(`data:image/jpeg;base64,${data.image}`);
+        if (STREAM_MODE === "landmarks") setLandmarkData(data);
+        else setVideoFrame(frameToSrc(data.image));
         setRotationCount(data.count);
 
         if (data.accuracy !== undefined) {
@@ -90,7 +95,7 @@ function ExOne() {
   setCompletionSpoken(false);
 
   // 🚀 START fresh backend session
-  socket.emit("start_rotation");
+  socket.emit("start_rotation", streamOptions());
 
   setStreaming(true);
   setPaused(false);
@@ -222,7 +227,9 @@ function ExOne() {
               justifyContent: "center",
             }}
           >
-            {videoFrame && streaming ? (
+            {streaming && STREAM_MODE === "landmarks" ? (
+              <LandmarkOverlay data={landmarkData} />
+            ) : videoFrame && streaming ? (
               <img
                 src={videoFrame}
                 alt="Wrist Tracking"
@@ -2,11 +2,14 @@ import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import io from "socket.io-client";
 import { useSpeechSynthesis } from "react-speech-kit";
+import { STREAM_MODE, ackFrame, frameToSrc, streamOptions } from "./utils/frame";
+import LandmarkOverlay from "./LandmarkOverlay";
 
 const socket = io("http://localhost:5000");
 
 function ExTwo() {
   const [videoFrame, setVideoFrame] = useState(null);
+  const [landmarkData, setLandmarkData] = useState(null);
   const [holdTime, setHoldTime] = useState(0);
   const [streaming, setStreaming] = useState(false);
   const [paused, setPaused] = useState(false);
@@ -23,8 +26,10 @@ function ExTwo() {
   // 🔹 Listen to backend feed
   useEffect(() => {
     socket.on("joinhands_feed", (data) => {
+      ackFrame(socket, data);
       if (!sessionCompleted && !paused && streaming) {
-        setVideoFrame(`data:image/jpeg;base64,${data.frame}`);
+        if (STREAM_MODE === "landmarks") setLandmarkData(data);
+        else setVideoFrame(frameToSrc(data.frame));
         if (data.hold_time !== undefined) setHoldTime(data.hold_time);
         if (data.accuracy !== undefined)
           setAccuracy(data.accuracy.toFixed(1));
@@ -75,7 +80,7 @@ function ExTwo() {
       text: "Let's begin! Raise your hands above your head and hold the position.",
       voice: voices[0],
     });
-    socket.emit("start_joinhands");
+    socket.emit("start_joinhands", streamOptions());
   };
 
   const handleRetry = () => startVideoFeed();
@@ -197,7 +202,9 @@ function ExTwo() {
               justifyContent: "center",
             }}
           >
-            {videoFrame && streaming ? (
+            {streaming && STREAM_MODE === "landmarks" ? (
+              <LandmarkOverlay data={landmarkData} />
+            ) : videoFrame && streaming ? (
               <img
                 src={videoFrame}
                 alt="Hold Tracking"
@@ -2,6 +2,8 @@ import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import io from "socket.io-client";
 import { useSpeechSynthesis } from "react-speech-kit";
+import { STREAM_MODE, ackFrame, frameToSrc, streamOptions } from "./utils/frame";
+import LandmarkOverlay from "./LandmarkOverlay";
 
 const socket = io("http://localhost:5000");
 
@@ -10,6 +12,7 @@ function ExZero() {
   const [completionSpoken, setCompletionSpoken] = useState(false);
   const [halfwaySpoken, setHalfwaySpoken] = useState(false);
   const [videoFrame, setVideoFrame] = useState(null);
+  const [landmarkData, setLandmarkData] = useState(null);
   const [openCloseCount, setOpenCloseCount] = useState(0);
   const [streaming, setStreaming] = useState(false);
   const [paused, setPaused] = useState(false);
@@ -25,8 +28,10 @@ function ExZero() {
   // ✅ Socket video feed listener
   useEffect(() => {
     socket.on("video_feed", (data) => {
+      ackFrame(socket, data);
       if (!sessionCompleted && !paused) {
-        setVideoFrame(`data:image/jpeg;base64,${data.frame}`);
+        if (STREAM_MODE === "landmarks") setLandmarkData(data);
+        else setVideoFrame(frameToSrc(data.frame));
         setOpenCloseCount(data.count);
 
         // 🎯 Use backend accuracy directly
@@ -108,7 +113,7 @@ setCompletionSpoken(false);
 setStartSpoken(false);
 
 // 🚀 START fresh backend session
-socket.emit("start_openclose");
+socket.emit("start_openclose", streamOptions());
 
 setStreaming(true);
 setPaused(false);
@@ -252,7 +257,9 @@ setPaused(false);
               justifyContent: "center",
             }}
           >
-            {videoFrame && streaming ? (
+            {streaming && STREAM_MODE === "landmarks" ? (
+              <LandmarkOverlay data={landmarkData} />
+            ) : videoFrame && streaming ? (
               <img
                 src={videoFrame}
                 alt="Hand Tracking"
@@ -0,0 +1,54 @@
+import { useEffect, useRef } from "react";
+import { decodeLandmarks, drawLandmarks } from "./utils/landmarks";
+
+// Local camera preview with the backend's landmarks drawn on top.
+// The backend mirrors frames before inference, so the preview is mirrored too.
+function LandmarkOverlay({ data }) {
+  const videoRef = useRef(null);
+  const canvasRef = useRef(null);
+
+  useEffect(() => {
+    let stream;
+    navigator.mediaDevices
+      .getUserMedia({ video: true, audio: false })
+      .then((s) => {
+        stream = s;
+        if (videoRef.current) videoRef.current.srcObject = s;
+      })
+      .catch((err) => console.error("Camera preview unavailable:", err));
+    return () => stream && stream.getTracks().forEach((t) => t.stop());
+  }, []);
+
+  useEffect(() => {
+    const canvas = canvasRef.current;
+    const video = videoRef.current;
+    if (!canvas || !data) return;
+    canvas.width = video?.videoWidth || 640;
+    canvas.height = video?.videoHeight || 480;
+    drawLandmarks(canvas.getContext("2d"), decodeLandmarks(data), data.model);
+  }, [data]);
+
+  const layer = {
+    position: "absolute",
+    inset: 0,
+    width: "100%",
+    height: "100%",
+    objectFit: "cover",
+    borderRadius: "12px",
+  };
+
+  return (
+    <div style={{ position: "relative", width: "100%", height: "100%" }}>
+      <video
+        ref={videoRef}
+        autoPlay
+        playsInline
+        muted
+        style={{ ...layer, transform: "scaleX(-1)" }}
+      />
+      <canvas ref={canvasRef} style={layer} />
+    </div>
+  );
+}
+
+export default LandmarkOverlay;
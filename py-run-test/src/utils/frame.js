@@ -0,0 +1,58 @@
+// src/utils/frame.js
+
+// "binary" receives raw JPEG bytes from the backend; "base64" is the
+// older string payload kept for compatibility.
+export const FRAME_TRANSPORT = "binary";
+
+let lastObjectUrl = null;
+
+export function frameToSrc(frame) {
+  if (typeof frame === "string") {
+    return `data:image/jpeg;base64,${frame}`;
+  }
+  if (lastObjectUrl) URL.revokeObjectURL(lastObjectUrl);
+  lastObjectUrl = URL.createObjectURL(new Blob([frame], { type: "image/jpeg" }));
+  return lastObjectUrl;
+}
+
+// "video" streams rendered JPEG frames; "landmarks" streams only landmark
+// arrays and draws them over the local camera preview.
+export const STREAM_MODE = "video";
+
+// Model input size relative to the camera frame, and whether the backend
+// may crop inference to the region around the last detected landmarks.
+export const INFERENCE_SCALE = 1.0;
+export const ROI_CROP = false;
+
+// Run inference every INFERENCE_STRIDE-th frame (every frame while moving
+// fast when ADAPTIVE_STRIDE is on); the backend fills the gaps with a
+// One-Euro filter. SMOOTH filters landmarks even at stride 1.
+export const INFERENCE_STRIDE = 1;
+export const ADAPTIVE_STRIDE = false;
+export const SMOOTH = false;
+
+// Let the backend skip inference and re-encoding while the scene is
+// static (e.g. during the rest countdown), sending a keep-alive frame.
+export const MOTION_GATE = true;
+
+// Acknowledge every frame so the backend can adapt JPEG quality, size and
+// frame rate to how quickly frames actually arrive.
+export const ACK_FRAMES = true;
+
+export function ackFrame(socket, data) {
+  if (ACK_FRAMES && data.seq !== undefined) socket.emit("frame_ack", { seq: data.seq });
+}
+
+export function streamOptions() {
+  return {
+    transport: FRAME_TRANSPORT,
+    mode: STREAM_MODE,
+    inference_scale: INFERENCE_SCALE,
+    roi: ROI_CROP,
+    stride: INFERENCE_STRIDE,
+    adaptive_stride: ADAPTIVE_STRIDE,
+    smooth: SMOOTH,
+    motion_gate: MOTION_GATE,
+    ack: ACK_FRAMES,
+  };
+}
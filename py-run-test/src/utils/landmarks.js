@@ -0,0 +1,62 @@
+// src/utils/landmarks.js
+
+// Landmark connections matching mediapipe's HAND_CONNECTIONS / POSE_CONNECTIONS.
+const CONNECTIONS = {
+  hand: [
+    [0, 1], [1, 2], [2, 3], [3, 4], [0, 5], [5, 6], [6, 7], [7, 8],
+    [5, 9], [9, 10], [10, 11], [11, 12], [9, 13], [13, 14], [14, 15],
+    [15, 16], [13, 17], [0, 17], [17, 18], [18, 19], [19, 20],
+  ],
+  pose: [
+    [0, 1], [1, 2], [2, 3], [3, 7], [0, 4], [4, 5], [5, 6], [6, 8],
+    [9, 10], [11, 12], [11, 13], [13, 15], [15, 17], [15, 19], [15, 21],
+    [17, 19], [12, 14], [14, 16], [16, 18], [16, 20], [16, 22], [18, 20],
+    [11, 23], [12, 24], [23, 24], [23, 25], [24, 26], [25, 27], [26, 28],
+    [27, 29], [28, 30], [29, 31], [30, 32], [27, 31], [28, 32],
+  ],
+};
+
+// Decode the backend's int16 (x, y, z, visibility) rows into point groups.
+export function decodeLandmarks(data) {
+  if (!data || !data.landmarks || !data.groups) return [];
+  const values = new Int16Array(data.landmarks);
+  const perGroup = values.length / 4 / data.groups;
+  const groups = [];
+  for (let g = 0; g < data.groups; g++) {
+    const points = [];
+    for (let i = 0; i < perGroup; i++) {
+      const o = (g * perGroup + i) * 4;
+      points.push({
+        x: values[o] / data.scale,
+        y: values[o + 1] / data.scale,
+        z: values[o + 2] / data.scale,
+        visibility: values[o + 3] / data.scale,
+      });
+    }
+    groups.push(points);
+  }
+  return groups;
+}
+
+export function drawLandmarks(ctx, groups, model, color = "#00ff00") {
+  const { width, height } = ctx.canvas;
+  ctx.clearRect(0, 0, width, height);
+  ctx.strokeStyle = color;
+  ctx.fillStyle = color;
+  ctx.lineWidth = 2;
+
+  for (const points of groups) {
+    ctx.beginPath();
+    for (const [a, b] of CONNECTIONS[model] || []) {
+      ctx.moveTo(points[a].x * width, points[a].y * height);
+      ctx.lineTo(points[b].x * width, points[b].y * height);
+    }
+    ctx.stroke();
+
+    for (const p of points) {
+      ctx.beginPath();
+      ctx.arc(p.x * width, p.y * height, 3, 0, 2 * Math.PI);
+      ctx.fill();
+    }
+  }
+}